@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Analiz adımlarını küçük bir bağımlılık grafiği olarak çalıştırır.
+# Her adım yalnızca kendi bağımlılıkları bitince başlar; bağımsız adımlar paralel koşar.
+
+ANALYSIS_MAX_WORKERS = int(os.environ.get("ANALYSIS_MAX_WORKERS", "6"))
+
+
+@dataclass
+class Step:
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]
+    deps: List[str] = field(default_factory=list)
+    default: Any = None
+
+
+class AnalysisExecutor:
+    def __init__(self, max_workers: int = ANALYSIS_MAX_WORKERS) -> None:
+        self.max_workers = max_workers
+
+    def run(self, steps: List[Step],
+            on_step_done: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        by_name = {s.name: s for s in steps}
+        for s in steps:
+            for d in s.deps:
+                if d not in by_name:
+                    raise ValueError(f"'{s.name}' adımı bilinmeyen adıma bağlı: {d}")
+
+        results: Dict[str, Any] = {}
+        pending = dict(by_name)
+        running: Dict[Future, str] = {}
+
+        def ready() -> List[Step]:
+            return [s for s in pending.values() if all(d in results for d in s.deps)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="analysis") as pool:
+            while pending or running:
+                for s in ready():
+                    del pending[s.name]
+                    deps = {d: results[d] for d in s.deps}
+                    running[pool.submit(s.fn, deps)] = s.name
+                if not running:
+                    raise ValueError(f"Döngüsel bağımlılık: {sorted(pending)}")
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    try:
+                        value = fut.result()
+                    except Exception as e:
+                        print(f"[ERROR] analiz adımı '{name}' başarısız: {e}")
+                        value = by_name[name].default
+                    results[name] = value
+                    if on_step_done is not None:
+                        try:
+                            on_step_done(name, value)
+                        except Exception as e:
+                            print(f"[ERROR] on_step_done '{name}': {e}")
+        return results
@@ -0,0 +1,155 @@
+import asyncio
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Analiz işleri: her gönderim bir job ID alır, sınırlı bir worker havuzunda koşar.
+# Biten işler boyut ve TTL ile sınırlı bir depoda tutulur; bekleyen/süren iş sayısı da sınırlıdır
+# (havuzun kuyruğu sınırsız olduğundan dolu olduğunda yeni iş reddedilir: JobQueueFull).
+# Aynı anahtarla gelen gönderimler hâlâ süren işe bağlanır (single-flight).
+# İş sırasında yayınlanan bölümler (publish) async abonelere anında iletilir (SSE).
+
+JOB_WORKERS = int(os.environ.get("ANALYSIS_JOB_WORKERS", "4"))
+JOB_RESULTS_MAX = int(os.environ.get("ANALYSIS_RESULTS_MAX", "200"))
+JOB_RESULTS_TTL = float(os.environ.get("ANALYSIS_RESULTS_TTL", str(30 * 60)))
+JOB_MAX_PENDING = int(os.environ.get("ANALYSIS_MAX_PENDING", "16"))  # kuyrukta + çalışan iş üst sınırı
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    status: str = "queued"  # queued | running | completed | failed
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    key: Optional[Hashable] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    events: List[Tuple[str, Any]] = field(default_factory=list, repr=False)
+    _subscribers: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Queue[Tuple[str, Any]]"]] = field(
+        default_factory=list, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def publish(self, event: str, data: Any, final: bool = False) -> None:
+        with self._lock:
+            # İş bitince ara bölümler bırakılır; geç gelen abone sadece son olayı alır
+            if final:
+                self.events = []
+            self.events.append((event, data))
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+            except RuntimeError:
+                pass
+
+    def subscribe(self) -> Tuple[List[Tuple[str, Any]], "asyncio.Queue[Tuple[str, Any]]"]:
+        queue: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue()
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+            return list(self.events), queue
+
+    def unsubscribe(self, queue: "asyncio.Queue[Tuple[str, Any]]") -> None:
+        with self._lock:
+            self._subscribers = [(l, q) for l, q in self._subscribers if q is not queue]
+
+    def to_status(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"job_id": self.id, "status": self.status}
+        if self.status == "completed":
+            out["results"] = self.result
+        elif self.status == "failed":
+            out["error"] = self.error
+        return out
+
+
+class JobManager:
+    def __init__(self, workers: int = JOB_WORKERS, max_results: int = JOB_RESULTS_MAX,
+                 ttl: float = JOB_RESULTS_TTL, max_pending: int = JOB_MAX_PENDING) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._inflight: Dict[Hashable, Job] = {}
+        self._lock = threading.Lock()
+        self.max_results = max_results
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self._pending = 0
+
+    def submit(self, fn: Callable[..., Dict[str, Any]], *args: Any, key: Optional[Hashable] = None,
+               progress: bool = False, **kwargs: Any) -> Job:
+        with self._lock:
+            if key is not None and key in self._inflight:
+                return self._inflight[key]
+            if self._pending >= self.max_pending:
+                raise JobQueueFull(f"Çok fazla analiz bekliyor ({self._pending}), lütfen daha sonra tekrar deneyin")
+            self._pending += 1
+            self._evict()
+            job = Job(id=uuid.uuid4().hex, key=key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._inflight[key] = job
+        if progress:
+            kwargs["on_section"] = job.publish
+        try:
+            self._pool.submit(self._run, job, fn, args, kwargs)
+        except RuntimeError:
+            # Havuz kapatıldı (uygulama duruyor): iş hiç başlamayacak
+            with self._lock:
+                self._pending -= 1
+                self._jobs.pop(job.id, None)
+                if key is not None and self._inflight.get(key) is job:
+                    del self._inflight[key]
+            raise
+        return job
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def _run(self, job: Job, fn: Callable[..., Dict[str, Any]], args: Any, kwargs: Any) -> None:
+        job.status = "running"
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = "completed"
+            job.publish("completed", job.result, final=True)
+        except Exception as e:
+            traceback.print_exc()
+            job.error = str(e)
+            job.status = "failed"
+            job.publish("failed", {"error": job.error}, final=True)
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._pending -= 1
+                if job.key is not None and self._inflight.get(job.key) is job:
+                    del self._inflight[job.key]
+                self._evict()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def _evict(self) -> None:
+        # Sadece bitmiş işler silinir: önce süresi dolanlar, sonra en eskiler
+        now = time.time()
+        finished = [j for j in self._jobs.values() if j.finished_at is not None]
+        for j in finished:
+            if now - j.finished_at > self.ttl:
+                del self._jobs[j.id]
+        finished = [j for j in finished if j.id in self._jobs]
+        overflow = len(finished) - self.max_results
+        for j in finished[:max(overflow, 0)]:
+            del self._jobs[j.id]
@@ -0,0 +1,123 @@
+"""Fikstür sayfası ayrıştırma mikro-benchmark'ı.
+
+Eski yol (tam belge, html.parser) ile html_parsing.parse_fixture_rows
+(lxml + SoupStrainer) karşılaştırılır ve saniyede ayrıştırılan sayfa sayısı yazılır.
+
+    python benchmarks/bench_html_parsing.py --pages kayitli_sayfalar/ --team Galatasaray
+
+--pages verilmezse Transfermarkt spielplandatum yapısını taklit eden sentetik bir sayfa kullanılır.
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from bs4.element import Tag  # noqa: E402
+
+from html_parsing import (  # noqa: E402
+    PARSER,
+    get_match_result_emoji,
+    parse_fixture_rows,
+    team_name_Temizle,
+    temizle_takim_adi,
+)
+
+
+def legacy_fixture_rows(html: str, team_name: str) -> List[Dict[str, Any]]:
+    # Önceki fetch_matches gövdesi (tam ağaç, html.parser)
+    s = BeautifulSoup(html, "html.parser")
+    div = s.find("div", class_="responsive-table")
+    if not isinstance(div, Tag):
+        return []
+    body = div.find("tbody")
+    if not isinstance(body, Tag):
+        return []
+    out = []
+    for row in body.find_all("tr"):
+        cols = row.find_all("td") if isinstance(row, Tag) else []
+        if len(cols) < 10:
+            continue
+        t = cols[1].get_text(strip=True)
+        sc = cols[-1].get_text(strip=True)
+        parts = sc.split(":")
+        opp = cols[6].get_text(strip=True)
+        em = ""
+        try:
+            if temizle_takim_adi(opp) == team_name_Temizle(team_name):
+                opp = cols[4].get_text(strip=True)
+                if len(parts) == 2:
+                    og, tg = map(int, parts)
+                    em = get_match_result_emoji(tg, og)
+            elif len(parts) == 2:
+                tg, og = map(int, parts)
+                em = get_match_result_emoji(tg, og)
+        except Exception:
+            continue
+        df = cols[-4].get_text(strip=True) or "Yok"
+        if re.match(r"\d+:\d+", sc):
+            out.append({"tarih": t, "rakip": opp, "sonuc": sc, "dizilis": df, "emoji": em})
+    return out
+
+
+def synthetic_fixture_page(team: str = "Galatasaray", rows: int = 45) -> str:
+    nav = "".join(f'<li><a href="/link/{i}" class="menu">Menü {i}</a><span>{"x" * 40}</span></li>' for i in range(600))
+    scripts = "".join(f"<script>var a{i} = {{k: '{'y' * 200}'}};</script>" for i in range(40))
+    trs = []
+    for i in range(rows):
+        home, away = (team, f"Rakip {i}") if i % 2 else (f"Rakip {i}", team)
+        score = f"{i % 4}:{(i * 7) % 3}"
+        tds = [
+            f"<td>{i}</td>", f"<td>{(i % 28) + 1:02d}.0{(i % 9) + 1}.2024</td>", "<td>20:00</td>",
+            "<td><img src='/logo.png'/></td>", f"<td><a title='{home}'>{home}</a></td>", "<td>-</td>",
+            f"<td><a title='{away}'>{away}</a></td>", "<td>4-2-3-1</td>", "<td>Hoca</td>", "<td>45.000</td>",
+            "<td>Stad</td>", f"<td><a href='/spielbericht/{i}'>{score}</a></td>",
+        ]
+        trs.append(f"<tr>{''.join(tds)}</tr>")
+    table = f'<div class="responsive-table"><table><thead><tr><th>#</th></tr></thead><tbody>{"".join(trs)}</tbody></table></div>'
+    return f"<html><head>{scripts}</head><body><header><ul>{nav}</ul></header><main>{table}</main><footer>{nav}</footer></body></html>"
+
+
+def bench(fn: Callable[[str, str], Any], pages: List[str], team: str, seconds: float) -> float:
+    n = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for html in pages:
+            fn(html, team)
+            n += 1
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", help="kaydedilmiş .html fikstür sayfalarının klasörü")
+    ap.add_argument("--team", default="Galatasaray")
+    ap.add_argument("--seconds", type=float, default=3.0)
+    args = ap.parse_args()
+
+    if args.pages:
+        pages = [open(p, encoding="utf-8").read() for p in sorted(glob.glob(os.path.join(args.pages, "*.html")))]
+    else:
+        pages = [synthetic_fixture_page(args.team)]
+    if not pages:
+        sys.exit("sayfa bulunamadı")
+
+    for html in pages:
+        if legacy_fixture_rows(html, args.team) != parse_fixture_rows(html, args.team):
+            sys.exit("HATA: yeni ayrıştırıcı farklı sonuç döndürdü")
+
+    kb = sum(len(p) for p in pages) / len(pages) / 1024
+    old = bench(legacy_fixture_rows, pages, args.team, args.seconds)
+    new = bench(parse_fixture_rows, pages, args.team, args.seconds)
+    print(f"sayfa: {len(pages)} (ort. {kb:.0f} KB)")
+    print(f"eski  html.parser, tam ağaç : {old:8.1f} sayfa/sn")
+    print(f"yeni  {PARSER}, strainer    : {new:8.1f} sayfa/sn  ({new / old:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
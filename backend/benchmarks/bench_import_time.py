@@ -0,0 +1,89 @@
+"""Açılış (import) süresi raporu: python -X importtime çıktısından.
+
+main her seferinde temiz bir süreçte import edilir; toplam süre, en pahalı modüller ve
+açılışta yüklenmemesi gereken ağır modüllerin (cv2, yt_dlp, sklearn, ...) yüklenip yüklenmediği yazılır.
+--eager ile aynı ölçüm görüntü yığını da yüklenerek (FAST_STARTUP=0 açılışı) tekrarlanır.
+
+    python benchmarks/bench_import_time.py --runs 5 --top 15 --budget-ms 1500
+
+Ağır bir modül açılışta yüklenirse ya da --budget-ms aşılırsa çıkış kodu 1 olur (regresyon kontrolü).
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("cv2", "yt_dlp", "sklearn", "ultralytics", "torch", "multiprocessing.pool", "concurrent.futures.process")
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$")
+
+
+def import_times(code: str) -> List[Tuple[str, int, int, int]]:
+    # (modül, self µs, kümülatif µs, derinlik); HF_TOKEN olmadan da import edilebilmeli
+    env = {k: v for k, v in os.environ.items() if k != "HF_TOKEN"}
+    env.setdefault("FOOTBALL_CACHE_DIR", os.path.join(BACKEND_DIR, "cache"))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BACKEND_DIR, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.exit(f"HATA: import başarısız:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), (len(m.group(3)) - 1) // 2))
+    return rows
+
+
+def measure(code: str, runs: int) -> Tuple[float, Dict[str, int], List[Tuple[str, int, int, int]]]:
+    totals = []
+    rows: List[Tuple[str, int, int, int]] = []
+    for _ in range(runs):
+        rows = import_times(code)
+        totals.append(sum(r[1] for r in rows))
+    loaded = {name: cum for name, _, cum, _ in rows}
+    return statistics.median(totals) / 1000, loaded, rows
+
+
+def report(title: str, total_ms: float, loaded: Dict[str, int], rows: List[Tuple[str, int, int, int]], top: int) -> List[str]:
+    print(f"\n== {title}: toplam import {total_ms:.0f} ms, {len(rows)} modül")
+    # Üst seviye (derinlik 0-1) modüller kümülatif süreye göre
+    shallow = sorted((r for r in rows if r[3] <= 1), key=lambda r: -r[2])[:top]
+    for name, _, cum, depth in shallow:
+        print(f"  {cum / 1000:8.1f} ms  {'  ' * depth}{name}")
+    heavy = [m for m in HEAVY_MODULES if m in loaded]
+    print(f"  ağır modüller: {', '.join(f'{m} ({loaded[m] / 1000:.0f} ms)' for m in heavy) or 'yok'}")
+    return heavy
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--module", default="main")
+    ap.add_argument("--runs", type=int, default=3, help="ölçüm tekrarı (medyan alınır)")
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--budget-ms", type=float, default=0.0, help="toplam import süresi üst sınırı (0 = yok)")
+    ap.add_argument("--eager", action="store_true", help="görüntü yığını yüklenmiş hâliyle de ölç")
+    args = ap.parse_args()
+
+    total, loaded, rows = measure(f"import {args.module}", args.runs)
+    heavy = report(f"import {args.module} (FAST_STARTUP)", total, loaded, rows, args.top)
+    if args.eager:
+        eager, eager_loaded, eager_rows = measure(f"import {args.module}; {args.module}.load_vision_stack()",
+                                                  args.runs)
+        report("görüntü yığını dahil (FAST_STARTUP=0)", eager, eager_loaded, eager_rows, args.top)
+        print(f"\nertelenen süre: {eager - total:.0f} ms ({eager / total:.1f}x)")
+
+    failed = False
+    if heavy:
+        print(f"REGRESYON: açılışta ağır modül yüklendi: {', '.join(heavy)}")
+        failed = True
+    if args.budget_ms and total > args.budget_ms:
+        print(f"REGRESYON: import süresi {total:.0f} ms > bütçe {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
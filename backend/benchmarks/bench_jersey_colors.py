@@ -0,0 +1,108 @@
+"""Forma rengi çıkarımı + oyuncu sınıflandırma mikro-benchmark'ı.
+
+Eski yol (kutu başına kırpma + cvtColor + cv2.mean, oyuncu başına iki norm) ile
+team_colors.batch_hsv_means + classify_players karşılaştırılır ve saniyede işlenen kutu sayısı yazılır.
+"HSV'siz" satırı main.initialize_team_colors çağrısıdır (hsv verilmez, kutular tek tek dönüştürülür);
+"paylaşılan HSV" satırı pipeline'daki durumdur: karenin HSV'si dedektörün saha maskesi için zaten
+hesaplanmıştır. HSV'siz yol eski yoldan belirgin yavaşsa (--min-ratio) çıkış kodu 1 olur.
+
+    python benchmarks/bench_jersey_colors.py --boxes 22 --width 1280 --height 720
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from team_colors import batch_hsv_means, classify_players  # noqa: E402
+
+
+def legacy_hsv_mean(image: np.ndarray, box: np.ndarray) -> np.ndarray:
+    # main.get_hsv_mean gövdesi
+    x1, y1, x2, y2 = map(int, box)
+    cropped = image[y1:y2, x1:x2]
+    if cropped.size == 0:
+        return np.array([0, 0, 0])
+    hsv_image = cv2.cvtColor(cropped, cv2.COLOR_BGR2HSV)
+    return np.array(cv2.mean(hsv_image)[:3])
+
+
+def legacy_classify(hsv_value: np.ndarray, a: np.ndarray, b: np.ndarray) -> str:
+    # main.classify_player gövdesi
+    da = np.linalg.norm(hsv_value - a)
+    db = np.linalg.norm(hsv_value - b)
+    return "A" if da < db else "B"
+
+
+def legacy(frame: np.ndarray, boxes: np.ndarray, a: np.ndarray, b: np.ndarray) -> List[str]:
+    return [legacy_classify(legacy_hsv_mean(frame, box), a, b) for box in boxes]
+
+
+def batch(frame: np.ndarray, boxes: np.ndarray, a: np.ndarray, b: np.ndarray) -> List[str]:
+    return classify_players(batch_hsv_means(frame, boxes), a, b, "A", "B")
+
+
+def batch_shared_hsv(frame: np.ndarray, boxes: np.ndarray, a: np.ndarray, b: np.ndarray) -> List[str]:
+    return classify_players(batch_hsv_means(frame, boxes, hsv=SHARED_HSV[id(frame)]), a, b, "A", "B")
+
+
+SHARED_HSV: Dict[int, np.ndarray] = {}
+
+
+def synthetic(width: int, height: int, n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    frame[: height // 2] = cv2.GaussianBlur(frame[: height // 2], (9, 9), 0)
+    # Oyuncular sahanın alt kısmına dağılmış (üstte tribün/skorbord)
+    x1 = rng.uniform(0, width - 80, n)
+    y1 = rng.uniform(height * 0.35, height - 160, n)
+    boxes = np.stack([x1, y1, x1 + rng.uniform(15, 80, n), y1 + rng.uniform(40, 160, n)], axis=1)
+    return frame, boxes.astype(np.float32)
+
+
+def bench(fn: Callable, frame: np.ndarray, boxes: np.ndarray, a: np.ndarray, b: np.ndarray, seconds: float) -> float:
+    n = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn(frame, boxes, a, b)
+        n += len(boxes)
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--boxes", type=int, default=22, help="kare başına oyuncu kutusu")
+    ap.add_argument("--width", type=int, default=1280)
+    ap.add_argument("--height", type=int, default=720)
+    ap.add_argument("--seconds", type=float, default=3.0)
+    ap.add_argument("--min-ratio", type=float, default=0.9, help="HSV'siz yol / eski yol alt sınırı (0 = yok)")
+    args = ap.parse_args()
+
+    frame, boxes = synthetic(args.width, args.height, args.boxes)
+    a, b = np.array([20.0, 60.0, 120.0]), np.array([110.0, 180.0, 150.0])
+
+    old_means = np.array([legacy_hsv_mean(frame, box) for box in boxes])
+    SHARED_HSV[id(frame)] = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    expected = legacy(frame, boxes, a, b)
+    if not np.allclose(old_means, batch_hsv_means(frame, boxes)) or batch(frame, boxes, a, b) != expected \
+            or batch_shared_hsv(frame, boxes, a, b) != expected:
+        sys.exit("HATA: toplu yol farklı sonuç döndürdü")
+
+    old = bench(legacy, frame, boxes, a, b, args.seconds)
+    new = bench(batch, frame, boxes, a, b, args.seconds)
+    shared = bench(batch_shared_hsv, frame, boxes, a, b, args.seconds)
+    print(f"kare: {args.width}x{args.height}, kare başına {args.boxes} kutu")
+    print(f"eski  kutu başına kırp+cvtColor : {old:10.0f} kutu/sn")
+    print(f"yeni  toplu, HSV'siz           : {new:10.0f} kutu/sn  ({new / old:.1f}x)")
+    print(f"yeni  toplu, paylaşılan HSV    : {shared:10.0f} kutu/sn  ({shared / old:.1f}x)")
+    if args.min_ratio and new < args.min_ratio * old:
+        sys.exit(f"REGRESYON: HSV'siz yol eski yolun {new / old:.2f} katı (< {args.min_ratio})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Akışlı video hattı benchmark'ı (yerel dosya ile).
+
+Tek thread'de çöz + analiz et (seri) ile video_pipeline.run_video_pipeline (çözme thread'i +
+sınırlı kuyruk + süreç havuzu) karşılaştırılır ve saniyede analiz edilen kare sayısı yazılır.
+Ardından hat sabit aralıkla ve uyarlanır örnekleyiciyle (frame_sampler) çalıştırılıp atlanan /
+analiz edilen kare sayıları ve toplam süre karşılaştırılır.
+
+    python benchmarks/bench_video_pipeline.py --video mac.mp4 --workers 4 --stride 1
+
+--video verilmezse yeşil saha üzerinde hareket eden oyuncular içeren sentetik bir klip üretilir;
+klipte yayın gibi düzenli aralıklarla yakın plan (saha dışı) bölümler bulunur.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_pipeline import VIDEO_MAX_WIDTH, VIDEO_WORKERS, analyze_frame, run_video_pipeline  # noqa: E402
+
+
+def synthetic_clip(path: str, frames: int = 300, width: int = 1280, height: int = 720, fps: int = 25,
+                   closeup_every: int = 0, closeup_length: int = 40) -> str:
+    rng = np.random.default_rng(0)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    pos = rng.uniform([0, height * 0.3], [width - 40, height - 90], (22, 2))
+    vel = rng.normal(0, 4, (22, 2))
+    for i in range(frames):
+        if closeup_every and i % closeup_every >= closeup_every - closeup_length:
+            # Yakın plan: ten/forma renkli büyük lekeler, çim yok
+            frame = np.empty((height, width, 3), np.uint8)
+            frame[:] = (60, 90, 150)
+            cv2.circle(frame, (width // 2 + (i % 50) * 4, height // 2), height // 3, (120, 160, 220), -1)
+            writer.write(frame)
+            continue
+        frame = np.empty((height, width, 3), np.uint8)
+        frame[:] = (40, 140, 50)
+        frame[: int(height * 0.25)] = (90, 90, 90)
+        pos = np.clip(pos + vel, [0, height * 0.3], [width - 40, height - 90])
+        for j, (x, y) in enumerate(pos.astype(int)):
+            color = (30, 30, 200) if j < 11 else (230, 230, 230)
+            cv2.rectangle(frame, (x, y), (x + 30, y + 80), color, -1)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def serial(path: str, stride: int, max_width: int) -> float:
+    cap = cv2.VideoCapture(path)
+    start = time.perf_counter()
+    index = analyzed = 0
+    while True:
+        if index % stride:
+            if not cap.grab():
+                break
+            index += 1
+            continue
+        ok, frame = cap.read()
+        if not ok:
+            break
+        if frame.shape[1] > max_width:
+            frame = cv2.resize(frame, (max_width, int(frame.shape[0] * max_width / frame.shape[1])),
+                               interpolation=cv2.INTER_AREA)
+        analyze_frame(index, frame)
+        analyzed += 1
+        index += 1
+    cap.release()
+    return analyzed / (time.perf_counter() - start)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--video", help="yerel video dosyası")
+    ap.add_argument("--workers", type=int, default=VIDEO_WORKERS)
+    ap.add_argument("--stride", type=int, default=1)
+    ap.add_argument("--max-width", type=int, default=VIDEO_MAX_WIDTH)
+    args = ap.parse_args()
+
+    path = args.video or synthetic_clip(os.path.join(tempfile.mkdtemp(), "bench.mp4"), frames=400, closeup_every=100)
+    base = serial(path, args.stride, args.max_width)
+    summary = run_video_pipeline(path, workers=args.workers, stride=args.stride, max_frames=10 ** 9,
+                                 max_width=args.max_width, adaptive=False)
+    adaptive = run_video_pipeline(path, workers=args.workers, stride=args.stride, max_frames=10 ** 9,
+                                  max_width=args.max_width, adaptive=True)
+    print(f"video: {path}")
+    print(f"seri  çöz + analiz (tek thread)  : {base:8.1f} kare/sn")
+    print(f"hat   {args.workers} işçi + sınırlı kuyruk   : {summary['fps']:8.1f} kare/sn  ({summary['fps'] / base:.1f}x)"
+          f"  [{summary['frames_analyzed']} kare, havuz açılışı dahil, {os.cpu_count()} çekirdek]")
+    for name, s in (("sabit aralık", summary), ("uyarlanır", adaptive)):
+        print(f"{name:13s}: {s['frames_analyzed']:5d} analiz / {s['frames_skipped']:5d} atlandı, "
+              f"{s['elapsed_seconds']:6.2f} sn")
+    if "sampling" in adaptive:
+        print(f"atlama nedenleri: {adaptive['sampling']['skipped_by']}, sahne kesmesi: {adaptive['sampling']['scene_cuts']}")
+    print(f"toplam süre kazancı: {summary['elapsed_seconds'] / adaptive['elapsed_seconds']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
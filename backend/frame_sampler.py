@@ -0,0 +1,90 @@
+import os
+from typing import Any, Dict, Optional
+
+import cv2
+import numpy as np
+
+from player_detector import GRASS_LOWER, GRASS_UPPER
+
+# Analizden önce ucuz ön eleme: yoklanan her kare 64x36'ya küçültülüp üç test yapılır.
+#  - çim oranı düşükse geniş saha çekimi değildir (yakın plan, tribün, reklam, çoğu tekrar) -> atla
+#  - H/S histogramı öncekinden çok farklıysa sahne kesmesi -> örnekleme sıklaşır (kısa bir süre için)
+#  - küçük karedeki parlaklık farkı çok azsa görüntü durağandır -> atla, aralık büyür
+# Yoklamalar arasındaki kareler çözücüde grab() ile geçilir.
+
+SAMPLER_MIN_GREEN = float(os.environ.get("SAMPLER_MIN_GREEN", "0.3"))
+SAMPLER_CUT_THRESHOLD = float(os.environ.get("SAMPLER_CUT_THRESHOLD", "0.35"))  # Bhattacharyya uzaklığı
+SAMPLER_STATIC_DIFF = float(os.environ.get("SAMPLER_STATIC_DIFF", "1.0"))  # 0-255 ortalama mutlak fark
+SAMPLER_MAX_STRIDE_FACTOR = int(os.environ.get("SAMPLER_MAX_STRIDE_FACTOR", "4"))
+SAMPLER_BURST = int(os.environ.get("SAMPLER_BURST", "3"))  # kesmeden sonra sık örneklenen kare sayısı
+THUMB_SIZE = (64, 36)
+
+
+class AdaptiveSampler:
+    def __init__(self, stride: int, min_green: float = SAMPLER_MIN_GREEN, cut_threshold: float = SAMPLER_CUT_THRESHOLD,
+                 static_diff: float = SAMPLER_STATIC_DIFF, max_factor: int = SAMPLER_MAX_STRIDE_FACTOR,
+                 burst: int = SAMPLER_BURST) -> None:
+        self.base = max(1, stride)
+        self.min_step = max(1, self.base // 2)
+        self.max_step = self.base * max(1, max_factor)
+        self.min_green = min_green
+        self.cut_threshold = cut_threshold
+        self.static_diff = static_diff
+        self.burst = burst
+        self.step = self.base  # bir sonraki yoklamaya kadar geçilecek kare
+        self._burst_left = 0
+        self._prev_hist: Optional[np.ndarray] = None
+        self._prev_v: Optional[np.ndarray] = None
+        self._last_analyzed = -10 ** 9
+        self.probed = 0
+        self.analyzed = 0
+        self.cuts = 0
+        self.skipped = {"not_wide": 0, "static": 0}
+
+    def check(self, index: int, frame: np.ndarray) -> bool:
+        # True: kare analize gönderilmeli. self.step bir sonraki yoklamanın uzaklığını verir
+        self.probed += 1
+        small = cv2.resize(frame, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        green = cv2.countNonZero(cv2.inRange(hsv, GRASS_LOWER, GRASS_UPPER)) / float(THUMB_SIZE[0] * THUMB_SIZE[1])
+        hist = cv2.calcHist([hsv], [0, 1], None, [16, 8], [0, 180, 0, 256])
+        cv2.normalize(hist, hist, 1.0, 0.0, cv2.NORM_L1)
+        v = hsv[:, :, 2]
+        cut = self._prev_hist is not None and \
+            cv2.compareHist(self._prev_hist, hist, cv2.HISTCMP_BHATTACHARYYA) > self.cut_threshold
+        diff = float(cv2.absdiff(v, self._prev_v).mean()) if self._prev_v is not None else float("inf")
+        self._prev_hist, self._prev_v = hist, v
+
+        if green < self.min_green:
+            # Saha dışı görüntü genelde birkaç saniye sürer: seyrek yokla, geri dönüşü kesme yakalar
+            self.skipped["not_wide"] += 1
+            self.step = self.max_step
+            return False
+        if cut:
+            self.cuts += 1
+            self._burst_left = self.burst
+            self.step = self.min_step
+        elif diff < self.static_diff and index - self._last_analyzed < self.max_step:
+            self.skipped["static"] += 1
+            self.step = min(self.step * 2, self.max_step)
+            return False
+        elif self._burst_left > 0:
+            self._burst_left -= 1
+            self.step = self.min_step
+        else:
+            self.step = self.base
+        self._last_analyzed = index
+        self.analyzed += 1
+        return True
+
+    def report(self, frames_decoded: int) -> Dict[str, Any]:
+        skipped = frames_decoded - self.analyzed
+        return {
+            "mode": "adaptive",
+            "frames_probed": self.probed,
+            "frames_analyzed": self.analyzed,
+            "frames_skipped": skipped,
+            "skipped_by": {"grab": max(0, frames_decoded - self.probed), **self.skipped},
+            "scene_cuts": self.cuts,
+            "analyzed_ratio": round(self.analyzed / frames_decoded, 4) if frames_decoded else None,
+        }
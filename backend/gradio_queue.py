@@ -0,0 +1,165 @@
+import asyncio
+import json
+import os
+import uuid
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from host_guard import RETRY_STATUSES, host_guard
+from http_client import async_safe_post, get_async_client
+
+# Hugging Face Space'lerdeki Gradio queue API'si için ortak async istemci.
+# queue/join ile iş kuyruğa eklenir, queue/data SSE akışı beklemeden (sleep yok) okunur.
+# Ara "process_generating" parçaları async iterator olarak dışarı verilir.
+
+SSE_READ_TIMEOUT = 120
+
+_HF_TOKEN: Optional[str] = None
+
+
+def get_hf_token() -> str:
+    # Token import sırasında değil, ilk Space isteğinde okunur: token gerektirmeyen
+    # uçlar (tahmin, takım bilgisi) ve testler HF_TOKEN olmadan da açılabilir
+    global _HF_TOKEN
+    if _HF_TOKEN:
+        return _HF_TOKEN
+    token = os.getenv("HF_TOKEN")
+    if not token:
+        # Ortam değişkeni olarak bulunamazsa, Secret Files yolunu dene
+        secret_file_path = "/etc/secrets/HF_TOKEN"
+        if not os.path.exists(secret_file_path):
+            # Ne ortam değişkeninde ne de Secret Files yolunda bulunamadı
+            raise RuntimeError("HF_TOKEN tanımlı değil. Lütfen ortam değişkeni olarak ekleyin veya Secret Files olarak doğru şekilde yüklediğinizden emin olun.")
+        try:
+            with open(secret_file_path, 'r') as f:
+                token = f.read().strip() # Dosyanın içeriğini oku ve boşlukları temizle
+            print("HF_TOKEN başarıyla Secret Files dosyasından okundu.")
+        except Exception as e:
+            raise RuntimeError(f"HF_TOKEN Secret Files dosyasından okunurken bir hata oluştu: {e}")
+    print(f"Kullanılan HF_TOKEN: {'*' * len(token)}") # Güvenlik için token'ın kendisini yazdırma
+    _HF_TOKEN = token
+    return token
+
+
+def hf_space_headers() -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {get_hf_token()}",
+        "Content-Type": "application/json"
+    }
+
+
+def _chunk_text(value: Any) -> str:
+    # Gradio 4+ akışta tam değer yerine diff listesi gönderebilir: [["append", [], "metin"], ...]
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(isinstance(op, list) and len(op) == 3 for op in value):
+        return "".join(op[2] for op in value if op[0] in ("append", "add", "replace") and isinstance(op[2], str))
+    return json.dumps(value, ensure_ascii=False)
+
+
+class GradioQueueClient:
+    def __init__(self, name: str, base_url: str, fn_index: int = 2, trigger_id: int = 12) -> None:
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.fn_index = fn_index  # app.py'de fonksiyon indexi 2 olmalı
+        self.trigger_id = trigger_id
+
+    async def stream(self, prompt: str) -> AsyncIterator[Tuple[str, Any]]:
+        # Olaylar: ("generating", parça) ... ve son olarak ("completed", metin) veya ("error", mesaj)
+        import httpx  # type: ignore
+
+        try:
+            headers = hf_space_headers()
+        except RuntimeError as e:
+            yield "error", f"[ERROR] {e}"
+            return
+        session_hash = f"sess-{uuid.uuid4().hex[:8]}"
+        join_payload = {
+            "data": [prompt],
+            "event_data": None,
+            "fn_index": self.fn_index,
+            "trigger_id": self.trigger_id,
+            "session_hash": session_hash,
+        }
+        print(f"[GPT_TAHMIN] [{self.name}] queue/join (session_hash={session_hash})")
+        join_resp = await async_safe_post(f"{self.base_url}/gradio_api/queue/join", json=join_payload,
+                                          headers=headers, timeout=30, retries=1)
+        if join_resp is None:
+            yield "error", "[ERROR] queue/join exception: bağlantı kurulamadı"
+            return
+        if join_resp.status_code != 200:
+            yield "error", f"[ERROR] queue/join failed: {join_resp.status_code} {join_resp.text}"
+            return
+        try:
+            event_id = join_resp.json().get("event_id")
+        except ValueError:
+            event_id = None
+        if not event_id:
+            yield "error", f"[ERROR] queue/join: event_id alınamadı: {join_resp.text}"
+            return
+
+        poll_url = f"{self.base_url}/gradio_api/queue/data"
+        params = {"session_hash": session_hash, "event_id": event_id}
+        timeout = httpx.Timeout(30, read=SSE_READ_TIMEOUT)
+        # SSE akışı da diğer upstream istekleri gibi host başına devre kesici ve hız sınırından geçer
+        host = urlsplit(poll_url).netloc
+        breaker = host_guard.breaker(host)
+        if not breaker.allow():
+            yield "error", f"[ERROR] {host} geçici olarak devre dışı (devre açık)"
+            return
+        delay = host_guard.bucket(host).reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            async with get_async_client().stream("GET", poll_url, params=params, headers=headers,
+                                                 timeout=timeout) as resp:
+                if resp.status_code != 200:
+                    if resp.status_code in RETRY_STATUSES:
+                        breaker.record_failure()
+                    yield "error", f"[ERROR] queue/data failed: {resp.status_code}"
+                    return
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    try:
+                        data: Dict[str, Any] = json.loads(line[6:])
+                    except ValueError as e:
+                        print(f"[GPT_TAHMIN] [{self.name}] SSE JSON parse hatası: {e}")
+                        continue
+                    msg = data.get("msg")
+                    output = data.get("output") or {}
+                    if msg == "process_generating" and output.get("data"):
+                        yield "generating", _chunk_text(output["data"][0])
+                    elif msg == "process_completed":
+                        breaker.record_success()
+                        if output.get("data"):
+                            yield "completed", output["data"][0]
+                        elif output.get("error"):
+                            yield "error", f"[ERROR] {output['error']}"
+                        else:
+                            yield "error", "[ERROR] process not successful"
+                        return
+        except httpx.TransportError as e:
+            breaker.record_failure()
+            print(f"[GPT_TAHMIN] [{self.name}] SSE exception: {e}")
+            yield "error", f"[ERROR] SSE polling exception: {e}"
+            return
+        except Exception as e:
+            print(f"[GPT_TAHMIN] [{self.name}] SSE exception: {e}")
+            yield "error", f"[ERROR] SSE polling exception: {e}"
+            return
+        # Akış sonuç vermeden kapandı
+        breaker.record_failure()
+        yield "error", "[ERROR] SSE'den sonuç alınamadı"
+
+    async def predict(self, prompt: str) -> str:
+        async for event, value in self.stream(prompt):
+            if event in ("completed", "error"):
+                return value
+        return "[ERROR] SSE'den sonuç alınamadı"
+
+
+GRADIO_MODELS: Dict[str, GradioQueueClient] = {
+    "sor_hf": GradioQueueClient("sor_hf", "https://husodu73-llmff.hf.space"),
+    "sor_hf_sir_alex": GradioQueueClient("sor_hf_sir_alex", "https://husodu73-modelalex.hf.space"),
+}
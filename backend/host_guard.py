@@ -0,0 +1,133 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Upstream host'ları korumak için host başına hız sınırı (token bucket), jitter'lı üstel geri çekilme
+# ve devre kesici. http_client'ın senkron ve async yolları aynı nesneleri paylaşır; bekleme süresi
+# burada hesaplanır, uyku (time.sleep / asyncio.sleep) çağıranın işidir.
+
+HOST_RATE_PER_SEC = float(os.environ.get("HOST_RATE_PER_SEC", "4"))
+HOST_BURST = float(os.environ.get("HOST_BURST", "8"))
+BACKOFF_CAP = float(os.environ.get("HTTP_BACKOFF_CAP", "30"))
+BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.environ.get("BREAKER_RESET_SECONDS", "30"))
+
+# Bu durum kodları geçici kabul edilir: tekrar denenir ve devre kesicide hata sayılır
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        # Bir jeton ayırır ve kullanılabilmesi için beklenmesi gereken süreyi döndürür.
+        # Jeton borca alınabilir; böylece bekleyenler sırayla ve adil şekilde dağıtılır.
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class CircuitBreaker:
+    def __init__(self, failures: int = BREAKER_FAILURES, reset_seconds: float = BREAKER_RESET_SECONDS) -> None:
+        self.max_failures = failures
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_seconds else "open"
+
+    def allow(self) -> bool:
+        # Açıkken hemen reddeder; süre dolunca tek bir deneme (half-open) isteğine izin verir
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            # Sonucu raporlanmayan (ör. beklenmeyen hata) deneme, süre dolunca yenisine yer açar
+            now = time.monotonic()
+            if state == "half_open" and (not self._probing or now - self._probe_started >= self.reset_seconds):
+                self._probing = True
+                self._probe_started = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            # Half-open denemesi başarısızsa ya da eşik aşıldıysa devre (yeniden) açılır
+            if self._probing or (self.opened_at is None and self.failures >= self.max_failures):
+                print(f"[WARN] devre kesici açıldı ({self.failures} hata)")
+                self.opened_at = time.monotonic()
+                self._probing = False
+
+
+class HostGuard:
+    def __init__(self, rate: float = HOST_RATE_PER_SEC, burst: float = HOST_BURST) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            b = self._buckets.get(host)
+            if b is None:
+                b = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return b
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            b = self._breakers.get(host)
+            if b is None:
+                b = self._breakers[host] = CircuitBreaker()
+            return b
+
+    def status(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            return {h: {"state": b.state, "failures": b.failures} for h, b in self._breakers.items()}
+
+
+host_guard = HostGuard()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # Retry-After saniye ya da HTTP tarihi olabilir
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float, retry_after: Optional[float] = None, cap: float = BACKOFF_CAP) -> float:
+    # "Full jitter": [0, min(cap, base * 2^attempt)]; sunucu Retry-After verdiyse en az o kadar beklenir
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    return max(delay, retry_after) if retry_after is not None else delay
@@ -0,0 +1,228 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+
+# Transfermarkt sayfaları için hızlı, seçici HTML ayrıştırma.
+# Tüm belge yerine sadece hedef alt ağaç (SoupStrainer) ve mümkünse lxml ile ayrıştırılır.
+# Hedef bulunamazsa tam ayrıştırmaya düşülür. Dönen sözlükler eskisiyle aynı alanları taşır;
+# fikstür satırlarındaki iç saha bayrağı ("ev") sadece with_side=True ile eklenir (yerel model için,
+# API çıktısına girmez).
+
+try:
+    import lxml  # type: ignore  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+FIXTURE_STRAINER = SoupStrainer("div", class_="responsive-table")
+ITEMS_TABLE_STRAINER = SoupStrainer("table", class_="items")
+TEAM_HEADER_STRAINER = SoupStrainer("header", class_="data-header")
+
+
+def parse_html(html: str, strainer: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    return BeautifulSoup(html, PARSER, parse_only=strainer)
+
+
+def _find_with_fallback(html: str, strainer: SoupStrainer, name: str, class_: str) -> Optional[Tag]:
+    node = parse_html(html, strainer).find(name, class_=class_)
+    if isinstance(node, Tag):
+        return node
+    node = parse_html(html).find(name, class_=class_)
+    return node if isinstance(node, Tag) else None
+
+
+def temizle_takim_adi(adi: str) -> str:
+    return re.sub(r"\(.*?\)", "", adi).strip().lower()
+
+
+def team_name_Temizle(team_name: str) -> str:
+    name = team_name.lower().strip()
+    name = re.sub(r'\bfc\b', '', name)
+    return name.strip()
+
+
+def get_match_result_emoji(team_score: int, opponent_score: int) -> str:
+    if team_score > opponent_score:
+        return "✅"
+    if team_score == opponent_score:
+        return "🤝"
+    return "❌"
+
+
+# --- Fikstür sayfası (spielplandatum) ---
+def parse_fixture_rows(html: str, team_name: str, limit: int = 500, with_side: bool = False) -> List[Dict[str, Any]]:
+    div = _find_with_fallback(html, FIXTURE_STRAINER, "div", "responsive-table")
+    if div is None:
+        return []
+    body = div.find("tbody")
+    if not isinstance(body, Tag):
+        return []
+    own = team_name_Temizle(team_name)
+    out: List[Dict[str, Any]] = []
+    for row in body.find_all("tr"):
+        cols = row.find_all("td") if isinstance(row, Tag) else []
+        if len(cols) < 10:
+            continue
+        t = cols[1].get_text(strip=True)
+        sc = cols[-1].get_text(strip=True)
+        parts = sc.split(":")
+        opp = cols[6].get_text(strip=True)
+        em = ""
+        ev = True  # skor her zaman "ev sahibi:deplasman" sırasındadır
+        try:
+            if temizle_takim_adi(opp) == own:
+                ev = False
+                opp = cols[4].get_text(strip=True)
+                if len(parts) == 2:
+                    og, tg = map(int, parts)
+                    em = get_match_result_emoji(tg, og)
+            else:
+                if len(parts) == 2:
+                    tg, og = map(int, parts)
+                    em = get_match_result_emoji(tg, og)
+        except Exception:
+            continue
+        df = cols[-4].get_text(strip=True) or "Yok"
+        if re.match(r"\d+:\d+", sc):
+            row_out = {"tarih": t, "rakip": opp, "sonuc": sc, "dizilis": df, "emoji": em}
+            if with_side:
+                row_out["ev"] = ev
+            out.append(row_out)
+        if len(out) >= limit:
+            break
+    return out
+
+
+# --- İki takım arası maçlar (bilanzdetail) ---
+def parse_h2h_rows(html: str) -> List[Dict[str, Any]]:
+    table = _find_with_fallback(html, ITEMS_TABLE_STRAINER, "table", "items")
+    if table is None:
+        return []
+    tbody = table.find("tbody")
+    if not isinstance(tbody, Tag):
+        return []
+    matches: List[Dict[str, Any]] = []
+    for row in tbody.find_all("tr"):
+        cols = row.find_all("td")
+        if len(cols) < 10:
+            continue
+        try:
+            date_text = cols[6].get_text(strip=True)
+            match_date = datetime.strptime(date_text, "%d.%m.%Y")
+            home_tag = cols[10].find('a')
+            home = home_tag['title'] if isinstance(home_tag, Tag) and home_tag.has_attr('title') else cols[10].get_text(strip=True)
+            guest_tag = cols[8].find('a')
+            guest = guest_tag['title'] if isinstance(guest_tag, Tag) and guest_tag.has_attr('title') else cols[8].get_text(strip=True)
+            result = cols[9].get_text(strip=True)
+            if result.startswith("-"):
+                continue
+            matches.append({
+                "date": match_date.strftime("%d.%m.%Y"),
+                "home_team": home,
+                "guest_team": guest,
+                "result": result
+            })
+        except (ValueError, IndexError):
+            continue
+    return matches
+
+
+# --- Takım sayfası başlığı (startseite) ---
+def parse_team_header(html: str) -> Dict[str, Any]:
+    soup: Any = parse_html(html, TEAM_HEADER_STRAINER)
+    if not isinstance(soup.find("h1", class_="data-header__headline-wrapper"), Tag):
+        soup = parse_html(html)
+    tn = soup.find("h1", class_="data-header__headline-wrapper")
+    team_name = tn.get_text(strip=True) if isinstance(tn, Tag) else "?"
+    lg = soup.find("span", class_="data-header__club")
+    league_name = lg.get_text(strip=True) if isinstance(lg, Tag) else "?"
+    league_rank = "?"
+    for label in soup.find_all("span", class_="data-header__label"):
+        if "Lig Sıralaması" in label.get_text():
+            cont = label.find_next_sibling("span", class_="data-header__content")
+            if isinstance(cont, Tag):
+                a = cont.find("a")
+                league_rank = a.get_text(strip=True) if isinstance(a, Tag) else cont.get_text(strip=True)
+            break
+    logo_div = soup.find("div", class_="data-header__profile-container")
+    logo_img = logo_div.find("img") if isinstance(logo_div, Tag) else None
+    logo_url = logo_img["src"] if isinstance(logo_img, Tag) and logo_img.has_attr("src") else None
+    cups: List[str] = []
+    for cup in soup.find_all("a", class_="data-header__success-data"):
+        title = cup.get("title", "Kupa") if isinstance(cup, Tag) else "Kupa"
+        num = cup.find("span", class_="data-header__success-number") if isinstance(cup, Tag) else None
+        cups.append(f"{title}: {num.get_text(strip=True) if isinstance(num, Tag) else '?'}")
+    market = soup.find("a", class_="data-header__market-value-wrapper")
+    squad_value = market.get_text(strip=True) if isinstance(market, Tag) else "?"
+
+    def find_data(label_text: str) -> str:
+        for li in soup.select("ul.data-header__items li"):
+            if label_text in li.get_text():
+                cont = li.find("span", class_="data-header__content") if isinstance(li, Tag) else None
+                return cont.get_text(strip=True) if isinstance(cont, Tag) else "?"
+        return "?"
+
+    return {
+        "Takım": team_name,
+        "Lig": league_name,
+        "Lig Sıralaması": league_rank,
+        "Logo URL": logo_url,
+        "Kupalar": cups,
+        "Kadro Değeri": squad_value,
+        "Yaş Ortalaması": find_data("Yaş ortalaması"),
+        "Stadyum": find_data("Stadyum"),
+    }
+
+
+# --- Hakem profili (profil/schiedsrichter) ---
+def parse_referee_profile(html: str) -> Dict[str, Any]:
+    s = parse_html(html)
+    img_tag = s.find("img", class_="data-header__profile-image")
+    img_url: Optional[str] = None
+    if isinstance(img_tag, Tag) and img_tag.has_attr("src"):
+        src_attr = img_tag.get("src")
+        if isinstance(src_attr, str):
+            img_url = src_attr
+        elif isinstance(src_attr, list) and src_attr:
+            img_url = src_attr[0]
+    spans = s.select("div.info-table--equal-space > span.info-table__content--bold")
+    dob = spans[0].get_text(strip=True) if spans else "?"
+    birthplace = next((sp.get_text(strip=True) for sp in spans if isinstance(sp, Tag) and "Türkiye" in sp.get_text()), "?")
+    # Sezon istatistikleri ayrı bir form POST'u ile gelir: (action, saison_id seçenekleri)
+    form_action: Optional[str] = None
+    seasons: Dict[str, str] = {}
+    form = s.find("form", action=re.compile(r"/profil/schiedsrichter"))
+    if isinstance(form, Tag):
+        action = form.get("action")
+        if isinstance(action, str):
+            form_action = action
+        sel = form.select_one("select[name='saison_id']")
+        if isinstance(sel, Tag):
+            for o in sel.find_all("option"):
+                value = o.get("value") if isinstance(o, Tag) else None
+                if isinstance(value, str) and value:
+                    seasons[o.get_text(strip=True)] = value
+    return {"photo_url": img_url, "dob": dob, "birthplace": birthplace, "form_action": form_action, "seasons": seasons}
+
+
+def parse_referee_season_stats(html: str) -> Optional[Dict[str, int]]:
+    # İstatistik tablosu yoksa None: sayfa beklenen biçimde değil, sıfırlar kaydedilmemeli
+    stats = {"matches": 0, "yellow": 0, "second_yellow": 0, "red": 0, "penalties": 0}
+    table = _find_with_fallback(html, ITEMS_TABLE_STRAINER, "table", "items")
+    tbody = table.find("tbody") if table is not None else None
+    if not isinstance(tbody, Tag):
+        return None
+    for rw in tbody.find_all("tr"):
+        cd = rw.find_all("td") if isinstance(rw, Tag) else []
+        if len(cd) < 7:
+            continue
+        try:
+            values = [int(cd[i].get_text(strip=True)) for i in range(2, 7)]
+        except ValueError:
+            continue
+        for k, v in zip(stats, values):
+            stats[k] += v
+    return stats
@@ -0,0 +1,228 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from host_guard import BACKOFF_CAP, RETRY_STATUSES, backoff_delay, host_guard, parse_retry_after
+from response_cache import RESPONSE_CACHE_ENABLED, cache_key, response_cache, ttl_for_url
+
+# Tüm scraper istekleri bu modül üzerinden geçer: tek bir keep-alive Session,
+# host başına sınırlı bağlantı havuzu ve httpx tabanlı async istemci.
+# Her istek host başına hız sınırından ve devre kesiciden (host_guard) geçer; geçici hatalar
+# jitter'lı üstel geri çekilmeyle tekrar denenir. Senkron istekler kalıcı yanıt önbelleğinden
+# (response_cache) geçer; host sağlıksızsa önbellekteki bayat yanıt döndürülür.
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Host başına açık tutulacak bağlantı sayısı (havuz doluysa istek bekler)
+POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "8"))
+# Kaç farklı host için havuz saklanacağı
+POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", "16"))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_thread_state = threading.local()
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    pool_block=True,
+                    max_retries=0,
+                )
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers.update(DEFAULT_HEADERS)
+                _session = s
+    return _session
+
+
+@contextmanager
+def revalidate() -> Iterator[None]:
+    # Bu blok içinde (aynı thread'de) önbellekteki kayıt taze olsa bile koşullu istekle
+    # (ETag / Last-Modified) yeniden doğrulanır. Prefetch işleri önbellek TTL'inden önce tazelerken kullanır.
+    previous = getattr(_thread_state, "revalidate", False)
+    _thread_state.revalidate = True
+    try:
+        yield
+    finally:
+        _thread_state.revalidate = previous
+
+
+def _send(session: requests.Session, method: str, url: str, headers: Optional[Dict[str, str]], timeout: float,
+          retries: int, wait: float, **kwargs: Any) -> Optional[requests.Response]:
+    host = urlsplit(url).netloc
+    breaker = host_guard.breaker(host)
+    resp = None
+    for attempt in range(retries):
+        if not breaker.allow():
+            print(f"[WARN] devre açık, istek atlanıyor: {url}")
+            return resp
+        delay = host_guard.bucket(host).reserve()
+        if delay:
+            time.sleep(delay)
+        retry_after = None
+        try:
+            resp = session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            breaker.record_failure()
+            print(f"[WARN] {type(e).__name__}, retrying {attempt+1}/{retries}... {url}")
+        except Exception as e:
+            print(f"[ERROR] {method} error: {e} {url}")
+            break
+        else:
+            if resp.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return resp
+            breaker.record_failure()
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            print(f"[WARN] HTTP {resp.status_code}, retrying {attempt+1}/{retries}... {url}")
+            if retry_after is not None and retry_after > BACKOFF_CAP:
+                break
+        if attempt + 1 < retries:
+            time.sleep(backoff_delay(attempt, wait, retry_after))
+    return resp
+
+
+def _request(method: str, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+             retries: int = 3, wait: float = 2, use_cache: bool = True,
+             data: Optional[Dict[str, Any]] = None) -> Optional[requests.Response]:
+    session = get_session()
+    ttl = ttl_for_url(url) if use_cache and RESPONSE_CACHE_ENABLED else None
+    if ttl is None:
+        return _send(session, method, url, headers, timeout, retries, wait, data=data)
+
+    key = cache_key(method, url, data)
+    cached = response_cache.get(key)
+    if cached is not None and cached.fresh and not getattr(_thread_state, "revalidate", False):
+        return cached.to_response()
+    req_headers = dict(headers or {})
+    if cached is not None:
+        req_headers.update(cached.validators())
+    resp = _send(session, method, url, req_headers, timeout, retries, wait, data=data)
+    if (resp is None or resp.status_code in RETRY_STATUSES) and cached is not None:
+        print(f"[WARN] host yanıt vermiyor, bayat önbellek kullanılıyor: {url}")
+        return cached.to_response()
+    if resp is None:
+        return None
+    if resp.status_code == 304 and cached is not None:
+        response_cache.refresh(key, ttl)
+        return cached.to_response()
+    if resp.status_code == 200:
+        response_cache.put(key, resp, ttl)
+    return resp
+
+
+def safe_get(url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+             retries: int = 3, wait: float = 2, use_cache: bool = True) -> Optional[requests.Response]:
+    return _request("GET", url, headers=headers, timeout=timeout, retries=retries, wait=wait, use_cache=use_cache)
+
+
+def safe_post(url: str, data: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+              timeout: float = 30, retries: int = 3, wait: float = 2,
+              use_cache: bool = True) -> Optional[requests.Response]:
+    return _request("POST", url, headers=headers, timeout=timeout, retries=retries, wait=wait,
+                    use_cache=use_cache, data=data)
+
+
+# --- Async (httpx) istemci ---
+# httpx.AsyncClient bir event loop'a bağlıdır; bu yüzden her loop için ayrı istemci tutulur.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> Any:
+    import httpx  # type: ignore
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        limits = httpx.Limits(
+            max_connections=POOL_MAXSIZE * POOL_CONNECTIONS,
+            max_keepalive_connections=POOL_MAXSIZE * POOL_CONNECTIONS,
+        )
+        client = httpx.AsyncClient(headers=DEFAULT_HEADERS, limits=limits, follow_redirects=True)
+        _async_clients[loop] = client
+    return client
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    per_loop = _host_semaphores.setdefault(loop, {})
+    host = urlsplit(url).netloc
+    sem = per_loop.get(host)
+    if sem is None:
+        sem = asyncio.Semaphore(POOL_MAXSIZE)
+        per_loop[host] = sem
+    return sem
+
+
+async def _async_request(method: str, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+                         retries: int = 3, wait: float = 2, **kwargs: Any) -> Optional[Any]:
+    import httpx  # type: ignore
+
+    client = get_async_client()
+    host = urlsplit(url).netloc
+    breaker = host_guard.breaker(host)
+    resp = None
+    for attempt in range(retries):
+        if not breaker.allow():
+            print(f"[WARN] devre açık, istek atlanıyor: {url}")
+            return resp
+        delay = host_guard.bucket(host).reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        retry_after = None
+        try:
+            async with _host_semaphore(url):
+                resp = await client.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        except httpx.TransportError as e:
+            breaker.record_failure()
+            print(f"[WARN] {type(e).__name__}, retrying {attempt+1}/{retries}... {url}")
+        except Exception as e:
+            print(f"[ERROR] async {method} error: {e} {url}")
+            break
+        else:
+            if resp.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return resp
+            breaker.record_failure()
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            print(f"[WARN] HTTP {resp.status_code}, retrying {attempt+1}/{retries}... {url}")
+            if retry_after is not None and retry_after > BACKOFF_CAP:
+                break
+        if attempt + 1 < retries:
+            await asyncio.sleep(backoff_delay(attempt, wait, retry_after))
+    return resp
+
+
+async def async_safe_get(url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+                         retries: int = 3, wait: float = 2) -> Optional[Any]:
+    return await _async_request("GET", url, headers=headers, timeout=timeout, retries=retries, wait=wait)
+
+
+async def async_safe_post(url: str, data: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+                          timeout: float = 30, retries: int = 3, wait: float = 2,
+                          json: Optional[Any] = None) -> Optional[Any]:
+    return await _async_request("POST", url, headers=headers, timeout=timeout, retries=retries, wait=wait,
+                                data=data, json=json)
+
+
+async def close_async_client() -> None:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,116 @@
+import hashlib
+import io
+import os
+import re
+import threading
+import time
+from typing import Optional, Tuple
+
+from http_client import safe_get
+from storage import cache_path, connect
+
+# Logo ve hakem fotoğrafları için içerik adresli (sha256) disk deposu.
+# Her görsel bir kez indirilir, istenirse küçültülür ve /assets/{hash} üzerinden
+# değişmez (immutable) önbellek başlıklarıyla sunulur; analiz yanıtında sadece URL kalır.
+
+ASSET_THUMB_SIZE = int(os.environ.get("ASSET_THUMB_SIZE", "160"))  # 0 = küçültme yok
+ASSET_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def make_thumbnail(data: bytes, size: int) -> Tuple[bytes, str]:
+    try:
+        from PIL import Image  # type: ignore
+    except ImportError:
+        return data, ""
+    try:
+        img = Image.open(io.BytesIO(data))
+        if max(img.size) <= size:
+            return data, ""
+        img.thumbnail((size, size))
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+        out = io.BytesIO()
+        img.save(out, format="PNG", optimize=True)
+        return out.getvalue(), "image/png"
+    except Exception as e:
+        print(f"[WARN] thumbnail oluşturulamadı: {e}")
+        return data, ""
+
+
+class ImageAssetStore:
+    def __init__(self, db_name: str = "assets.sqlite3", thumb_size: int = ASSET_THUMB_SIZE) -> None:
+        self._db_name = db_name
+        self.thumb_size = thumb_size
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self._db_name)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS assets (hash TEXT PRIMARY KEY, content_type TEXT, size INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS asset_urls (url TEXT PRIMARY KEY, hash TEXT, fetched_at REAL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def path(self, asset_hash: str) -> str:
+        return cache_path("assets", asset_hash[:2], asset_hash)
+
+    def lookup(self, asset_hash: str) -> Optional[Tuple[str, str]]:
+        if not ASSET_HASH_RE.match(asset_hash):
+            return None
+        with self._lock:
+            row = self._db().execute("SELECT content_type FROM assets WHERE hash = ?", (asset_hash,)).fetchone()
+        path = self.path(asset_hash)
+        if row is None or not os.path.exists(path):
+            return None
+        return path, row[0]
+
+    def fetch(self, url: str) -> Optional[str]:
+        if not url:
+            return None
+        with self._lock:
+            row = self._db().execute("SELECT hash FROM asset_urls WHERE url = ?", (url,)).fetchone()
+        if row and os.path.exists(self.path(row[0])):
+            return row[0]
+        # Görsel kendi deposunda tutulduğu için yanıt önbelleğine ayrıca yazılmaz
+        r = safe_get(url, timeout=30, use_cache=False)
+        if r is None or r.status_code != 200 or not r.content:
+            return None
+        content_type = r.headers.get("Content-Type", "image/png").split(";")[0]
+        data = r.content
+        if self.thumb_size:
+            data, thumb_type = make_thumbnail(data, self.thumb_size)
+            content_type = thumb_type or content_type
+        asset_hash = hashlib.sha256(data).hexdigest()
+        path = self.path(asset_hash)
+        if not os.path.exists(path):
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO assets (hash, content_type, size) VALUES (?, ?, ?)",
+                       (asset_hash, content_type, len(data)))
+            db.execute("INSERT OR REPLACE INTO asset_urls (url, hash, fetched_at) VALUES (?, ?, ?)",
+                       (url, asset_hash, time.time()))
+            db.commit()
+        return asset_hash
+
+
+image_assets = ImageAssetStore()
+
+
+def image_asset_url(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    try:
+        asset_hash = image_assets.fetch(url)
+    except Exception as e:
+        print(f"image_asset_url error:{e}")
+        return None
+    return f"/assets/{asset_hash}" if asset_hash else None
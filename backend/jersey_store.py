@@ -0,0 +1,148 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from storage import cache_path, connect
+
+# Forma yüklemeleri için içerik adresli (sha256) depo. Yükleme parça parça okunur, okunurken
+# hash'lenip geçici dosyaya yazılır (bellekte tutulmaz) ve hash adıyla yerine taşınır: aynı dosya adıyla
+# gelen farklı kullanıcılar birbirinin dosyasını ezemez, aynı görsel iki kez saklanmaz. HSV imzası
+# (görselin ortalama HSV'si) yüklemede bir kez çözülüp hash ile önbelleğe alınır.
+
+JERSEY_MAX_BYTES = int(os.environ.get("JERSEY_MAX_BYTES", str(10 * 1024 * 1024)))
+JERSEY_CHUNK_SIZE = int(os.environ.get("JERSEY_CHUNK_SIZE", str(256 * 1024)))
+JERSEY_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class JerseyTooLarge(ValueError):
+    pass
+
+
+def jersey_hsv(data: Any) -> Optional[np.ndarray]:
+    # data: dosya yolu ya da bellekteki kodlanmış görsel.
+    # cv2 burada yüklenir: yükleme uç noktası görüntü yığınını açılışta çekmesin
+    import cv2
+
+    if isinstance(data, str):
+        img = cv2.imread(data, cv2.IMREAD_COLOR)
+    else:
+        buf = np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray, memoryview)) else data
+        img = cv2.imdecode(buf, cv2.IMREAD_COLOR) if buf is not None and buf.size else None
+    if img is None:
+        return None
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    return np.array(cv2.mean(hsv)[:3])
+
+
+class JerseyStore:
+    def __init__(self, db_name: str = "jerseys.sqlite3", max_bytes: int = JERSEY_MAX_BYTES) -> None:
+        self._db_name = db_name
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, Optional[np.ndarray]] = {}
+        self.decodes = 0
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self._db_name)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jersey_signatures "
+                "(hash TEXT PRIMARY KEY, h REAL, s REAL, v REAL, size INTEGER, created_at REAL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def path(self, jersey_hash: str) -> str:
+        return cache_path("jerseys", jersey_hash[:2], jersey_hash)
+
+    def _commit(self, tmp_path: str, jersey_hash: str, size: int) -> None:
+        # Bloklayan işler (taşıma, görsel çözme, SQLite) thread havuzunda çalışır
+        path = self.path(jersey_hash)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if jersey_hash in self._signatures:
+                return
+        self._remember(jersey_hash, jersey_hsv(path), size)
+
+    def _remember(self, jersey_hash: str, sig: Optional[np.ndarray], size: int) -> None:
+        self.decodes += 1
+        if sig is None:
+            print(f"[WARN] forma görseli çözülemedi: {jersey_hash}")
+        with self._lock:
+            self._signatures[jersey_hash] = sig
+            if sig is not None:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO jersey_signatures (hash, h, s, v, size, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (jersey_hash, *map(float, sig), size, time.time()),
+                )
+                db.commit()
+
+    async def save_upload(self, upload: Any) -> Optional[str]:
+        # upload: FastAPI UploadFile (await read(n)). Parçalar hash'lenip geçici dosyaya yazılır;
+        # boyut sınırı aşılırsa ya da yükleme yarıda kalırsa geçici dosya silinir. Boş yükleme None döner
+        from fastapi.concurrency import run_in_threadpool
+
+        tmp_dir = os.path.dirname(cache_path("jerseys", "tmp", "_"))
+        tmp = await run_in_threadpool(tempfile.NamedTemporaryFile, dir=tmp_dir, delete=False)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            while True:
+                chunk = await upload.read(JERSEY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise JerseyTooLarge(f"Forma görseli çok büyük (en fazla {self.max_bytes // (1024 * 1024)} MB)")
+                digest.update(chunk)
+                await run_in_threadpool(tmp.write, chunk)
+            await run_in_threadpool(tmp.close)
+            if not size:
+                await run_in_threadpool(os.unlink, tmp.name)
+                return None
+            jersey_hash = digest.hexdigest()
+            await run_in_threadpool(self._commit, tmp.name, jersey_hash, size)
+            return jersey_hash
+        except BaseException:
+            tmp.close()
+            if os.path.exists(tmp.name):
+                os.unlink(tmp.name)
+            raise
+
+    def signature(self, jersey_hash: Optional[str]) -> Optional[np.ndarray]:
+        # İmza yüklemede hesaplanır; burada bellek ya da SQLite'tan okunur. Disk dosyası sadece
+        # önbellek kaybolmuşsa (ör. eski kayıt) çözülür
+        if not jersey_hash or not JERSEY_HASH_RE.match(jersey_hash):
+            return None
+        with self._lock:
+            if jersey_hash in self._signatures:
+                return self._signatures[jersey_hash]
+            row = self._db().execute(
+                "SELECT h, s, v FROM jersey_signatures WHERE hash = ?", (jersey_hash,)
+            ).fetchone()
+        if row is not None:
+            sig = np.array(row, dtype=np.float64)
+            with self._lock:
+                self._signatures[jersey_hash] = sig
+            return sig
+        path = self.path(jersey_hash)
+        if not os.path.exists(path):
+            print(f"[WARN] forma bulunamadı: {jersey_hash}")
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+        sig = jersey_hsv(data)
+        self._remember(jersey_hash, sig, len(data))
+        return sig
+
+
+jersey_store = JerseyStore()
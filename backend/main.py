@@ -1,39 +1,62 @@
-import multiprocessing
-import cv2
+import asyncio
+from contextlib import aclosing
 import numpy as np
-# from ultralytics import YOLO  # type: ignore  # <-- KALDIRILDI
-from sklearn.cluster import KMeans  # type: ignore
-import yt_dlp  # type: ignore
+# from ultralytics import YOLO  # type: ignore  # <-- KALDIRILDI (yerine CPU dedektörü: player_detector)
+# cv2, yt_dlp, multiprocessing ve görüntü modülleri ilk video analizinde yüklenir (load_vision_stack)
 import os
-import base64
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form  # type: ignore
 from fastapi.middleware.cors import CORSMiddleware  # type: ignore
-import tempfile
+from fastapi.responses import FileResponse, StreamingResponse  # type: ignore
 import threading
-from typing import Optional, Any, Dict
+import time
+from typing import TYPE_CHECKING, Optional, Any, Callable, Dict, List
 import requests
 from bs4.element import Tag  # type: ignore
 from datetime import datetime
 import traceback
 from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
 
 # İçerik Getirici Fonksiyonlar GPT Alanı için
 from gpt_area import (
     get_team_last_5_matches_with_tactics,
     get_last_matches,
+    get_team_matches,
     prepare_the_prompt,
     sor_hf,
-    predict_match,
+    predict_match_async,
+    predict_match_local,
+    predict_match_stream,
     analyze_team_performance,
-    analyze_referee_stats
 )  # type: ignore
 
 # Takım ve hakem bilgileri için (alias to avoid naming conflict)
 from team_info import (
     get_team_info as fetch_team_info,
-    get_referee_info,
-    get_image_as_base64
+    get_referee_stats,
+    fetch_referee_stats,
+    search_team_url,
 )
+from http_client import async_safe_get
+from host_guard import host_guard
+from jersey_store import JerseyTooLarge, jersey_store
+from analysis_executor import AnalysisExecutor, Step
+from team_store import load_team_names, normalize_team_name, prewarm_team_store
+from referee_store import prewarm_referee_store, render_referee_html
+from analysis_jobs import JobManager, JobQueueFull
+from single_flight import SingleFlight, fixture_key
+from prefetch_scheduler import PREFETCH_ENABLED, PREFETCH_MAX_FIXTURES_PER_REQUEST, PrefetchScheduler
+from sse import SSE_HEADERS, SSE_KEEPALIVE, sse_event
+from image_assets import image_assets, image_asset_url
+from prediction_cache import prediction_cache
+from matchday import predict_matchday
+
+if TYPE_CHECKING:
+    from team_colors import TeamColorModel
+
+# Açılışta sadece API/scraping yığını yüklenir; görüntü yığını ilk video analizine ertelenir.
+# FAST_STARTUP=0: görüntü yığını açılışta yüklenir (ilk video analizi beklemez, eksik bağımlılık hemen görülür)
+FAST_STARTUP = os.environ.get("FAST_STARTUP", "1") == "1"
 
 app = FastAPI(title="Futbol Analiz API")  # type: ignore
 
@@ -49,22 +72,36 @@ app.add_middleware(
 # Global değişkenler
 team_a_color = None
 team_b_color = None
-analysis_running = False
-analysis_thread: Optional[threading.Thread] = None
-analysis_results: Optional[Dict[str, Any]] = None
+analysis_jobs = JobManager()
+predict_flight = SingleFlight()
+# Takım/hakem verilerini talepten önce tazeleyen arka plan zamanlayıcısı
+prefetcher = PrefetchScheduler({
+    "team_info": fetch_team_info,
+    "fixtures": get_team_matches,
+    "h2h": get_last_matches,
+    "referee": fetch_referee_stats,
+})
 
-# Renk çıkarım fonksiyonları
+def load_vision_stack() -> None:
+    # Modüller bir kez yüklenir; sonraki çağrılar sys.modules'tan döner
+    started = time.perf_counter()
+    import cv2  # noqa: F401
+    import video_pipeline  # noqa: F401
+    import team_colors  # noqa: F401
+    import player_tracker  # noqa: F401
+    import match_accumulators  # noqa: F401
+    try:
+        import yt_dlp  # type: ignore  # noqa: F401
+    except ImportError:
+        print("[WARN] yt_dlp yüklü değil: sadece yerel video dosyaları analiz edilebilir")
+    print(f"[LOG] görüntü yığını yüklendi ({time.perf_counter() - started:.2f} sn)")
 
-def extract_jersey_hsv(path: str) -> Optional[np.ndarray]:
-    img = cv2.imread(path)
-    if img is None:
-        print(f"Forma dosyası okunamadı: {path}")
-        return None
-    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-    return np.array(cv2.mean(hsv)[:3])
 
+# Renk çıkarım fonksiyonları
 
 def get_hsv_mean(image: np.ndarray, box) -> np.ndarray:
+    import cv2
+
     x1, y1, x2, y2 = map(int, box.xyxy[0])
     cropped = image[y1:y2, x1:x2]
     if cropped.size == 0:
@@ -73,17 +110,14 @@ def get_hsv_mean(image: np.ndarray, box) -> np.ndarray:
     return np.array(cv2.mean(hsv_image)[:3])
 
 
-def initialize_team_colors(player_boxes, frame: np.ndarray):
-    hsv_values = []
-    for box in player_boxes:
-        hsv_mean = get_hsv_mean(frame, box)
-        if hsv_mean is not None and hsv_mean.any():
-            hsv_values.append(hsv_mean)
-    if len(hsv_values) < 2:
-        return None, None
-    kmeans = KMeans(n_clusters=2, random_state=0).fit(hsv_values)
-    colors = kmeans.cluster_centers_
-    return (colors[0], colors[1]) if colors[0][1] < colors[1][1] else (colors[1], colors[0])
+def initialize_team_colors(player_boxes, frame: np.ndarray, model: Optional["TeamColorModel"] = None):
+    # Tüm kutuların HSV ortalaması tek çağrıda (team_colors.batch_hsv_means; HSV yoksa sadece kutular dönüştürülür).
+    # Her çağrıda KMeans fit edilmez: verilen model artımlı güncellenir, yoksa tek seferlik model kurulur
+    from team_colors import TeamColorModel, batch_hsv_means
+
+    model = model or TeamColorModel()
+    model.partial_fit(batch_hsv_means(frame, player_boxes))
+    return model.colors()
 
 
 def classify_player(hsv_value: np.ndarray, team_a_color: np.ndarray, team_b_color: np.ndarray,
@@ -96,59 +130,159 @@ def classify_player(hsv_value: np.ndarray, team_a_color: np.ndarray, team_b_colo
 
 # Video ve analiz fonksiyonu
 
+# Akış (SSE) ile parça parça gönderilen bölümler ve her bölümün beklediği adımlar
+ANALYSIS_SECTIONS: Dict[str, List[str]] = {
+    "team_info": ["team_a_info", "team_b_info"],
+    "form": ["team_a_form", "team_b_form"],
+    "head_to_head": ["head_to_head"],
+    "referees": ["main_ref", "side_ref"],
+    "logos": ["team_a_logo", "team_b_logo", "main_ref_photo", "side_ref_photo"],
+    "video": ["video"],
+}
+
+
+def _logo_from_info(info: Dict[str, Any]) -> Optional[str]:
+    logo_url = info.get("Logo URL")
+    return image_asset_url(logo_url) if isinstance(logo_url, str) else None
+
+
+def _deep_merge(dst: Dict[str, Any], src: Dict[str, Any]) -> Dict[str, Any]:
+    for k, v in src.items():
+        if isinstance(v, dict) and isinstance(dst.get(k), dict):
+            _deep_merge(dst[k], v)
+        else:
+            dst[k] = v
+    return dst
+
+
+def _section_fragment(section: str, res: Dict[str, Any], team_a: str, team_b: str,
+                      main_ref: Optional[str], side_ref: Optional[str]) -> Dict[str, Any]:
+    # Her bölüm, nihai summary_data'nın bir parçasıdır; parçalar birleşince tam sonuç oluşur
+    if section == "team_info":
+        return {"teams": {"team_a": {"name": team_a, "info": res["team_a_info"]},
+                          "team_b": {"name": team_b, "info": res["team_b_info"]}}}
+    if section == "form":
+        def form(f: Any) -> Dict[str, Any]:
+            matches, wins, draws, losses, performance = f
+            return {"last_matches": matches, "stats": {"wins": wins, "draws": draws, "losses": losses},
+                    "performance_analysis": performance}
+        return {"teams": {"team_a": form(res["team_a_form"]), "team_b": form(res["team_b_form"])}}
+    if section == "head_to_head":
+        return {"head_to_head": res["head_to_head"]}
+    if section == "referees":
+        def ref(name: Optional[str], key: str) -> Optional[Dict[str, Any]]:
+            if not name:
+                return None
+            stats = res[key]
+            if stats is None:
+                return {"name": name, "info": "<b>❌ Hakem bulunamadı.</b>", "stats": None, "referee_analysis": None}
+            # HTML sadece yanıtta üretilir; ortalamalar doğrudan sayısal istatistiklerden gelir
+            return {"name": name, "info": render_referee_html(stats), "stats": stats.display(),
+                    "referee_analysis": stats.averages()}
+        return {"referees": {"main": ref(main_ref, "main_ref"), "side": ref(side_ref, "side_ref")}}
+    if section == "logos":
+        return {
+            "teams": {"team_a": {"logo": res["team_a_logo"]}, "team_b": {"logo": res["team_b_logo"]}},
+            "referees": {"main": {"photo": res["main_ref_photo"]} if main_ref else None,
+                         "side": {"photo": res["side_ref_photo"]} if side_ref else None},
+        }
+    if section == "video":
+        return {"video": res["video"]}
+    raise ValueError(f"Bilinmeyen bölüm: {section}")
+
+
+def analyze_video(youtube_url: str, team_a: str, team_b: str,
+                  team_a_jersey: Optional[str] = None, team_b_jersey: Optional[str] = None) -> Dict[str, Any]:
+    from match_accumulators import MatchAccumulator, foot_points
+    from player_tracker import PlayerTracker
+    from team_colors import TeamColorModel
+    from video_pipeline import run_video_pipeline
+
+    # Forma yüklendiyse (içerik hash'i) takım renk modeli önbellekteki HSV imzasından tohumlanır;
+    # aksi hâlde ilk oyuncu kutularından kurulur
+    model = TeamColorModel(jersey_store.signature(team_a_jersey), jersey_store.signature(team_b_jersey))
+    tracker = PlayerTracker()
+    accumulator = MatchAccumulator()
+    counts = {team_a: 0, team_b: 0, "Unknown": 0}
+    names = (team_a, team_b)
+
+    def on_frame(result: Dict[str, Any]) -> None:
+        # İşçiler kutu renklerini çıkarır; takip ve model durumu tek yerde (bu süreçte) tutulur.
+        # Takımı önbellekte olan izler yeniden sınıflandırılmaz, sadece yeni/şüpheli/eskimiş izler
+        hsv = result.get("players_hsv")
+        if hsv is None or not len(hsv):
+            return
+        ids, need = tracker.update(result["boxes"], result["frame"], result.get("frame_size"))
+        if need.any():
+            model.partial_fit(hsv[need])
+            tracker.set_colors(ids[need], hsv[need], model.predict)
+        teams = tracker.team_of(ids)
+        result["track_ids"] = ids
+        result["teams"] = [names[t] if t is not None else "Unknown" for t in teams]
+        for name in result["teams"]:
+            counts[name] += 1
+        if result.get("frame_size"):
+            accumulator.update(result["frame"], foot_points(result["boxes"], result["frame_size"]), teams)
+
+    config = {"team_a": team_a, "team_b": team_b}
+    summary = run_video_pipeline(youtube_url, on_frame=on_frame, config=config)
+    a, b = model.colors()
+    summary["team_colors"] = {team_a: a.tolist() if a is not None else None,
+                              team_b: b.tolist() if b is not None else None}
+    summary["player_detections"] = counts
+    summary["players"] = tracker.players(names)
+    summary["tracking"] = tracker.stats()
+    summary["positions"] = accumulator.to_dict(names)
+    return summary
+
+
 def main_analysis(
     team_a: str,
     team_b: str,
     main_ref: Optional[str],
     side_ref: Optional[str],
-    team_a_jersey_path: Optional[str] = None,
-    team_b_jersey_path: Optional[str] = None,
-    youtube_url: Optional[str] = None
+    team_a_jersey: Optional[str] = None,
+    team_b_jersey: Optional[str] = None,
+    youtube_url: Optional[str] = None,
+    on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None
 ) -> Dict[str, Any]:
-    global team_a_color, team_b_color
     try:
-        team_a_info = fetch_team_info(team_a)
-        team_b_info = fetch_team_info(team_b)
-        main_ref_info, main_ref_img = get_referee_info(main_ref) if main_ref else ("", None)
-        side_ref_info, side_ref_img = get_referee_info(side_ref) if side_ref else ("", None)
-        team_a_matches, team_a_wins, team_a_draws, team_a_losses, team_a_performance = get_team_last_5_matches_with_tactics(team_a)
-        team_b_matches, team_b_wins, team_b_draws, team_b_losses, team_b_performance = get_team_last_5_matches_with_tactics(team_b)
-        head_to_head_matches = get_last_matches(team_a, team_b)
-        logo_url_a = team_a_info.get("Logo URL")
-        team_a_logo = get_image_as_base64(logo_url_a) if isinstance(logo_url_a, str) else None
-        logo_url_b = team_b_info.get("Logo URL")
-        team_b_logo = get_image_as_base64(logo_url_b) if isinstance(logo_url_b, str) else None
-        main_ref_photo = get_image_as_base64(main_ref_img) if main_ref_img else None
-        side_ref_photo = get_image_as_base64(side_ref_img) if side_ref_img else None
-        main_ref_analysis = analyze_referee_stats(main_ref_info) if main_ref_info else None
-        side_ref_analysis = analyze_referee_stats(side_ref_info) if side_ref_info else None
-        summary_data = {
-            "teams": {
-                "team_a": {
-                    "name": team_a,
-                    "info": team_a_info,
-                    "logo": team_a_logo,
-                    "last_matches": team_a_matches,
-                    "stats": {"wins": team_a_wins, "draws": team_a_draws, "losses": team_a_losses},
-                    "performance_analysis": team_a_performance
-                },
-                "team_b": {
-                    "name": team_b,
-                    "info": team_b_info,
-                    "logo": team_b_logo,
-                    "last_matches": team_b_matches,
-                    "stats": {"wins": team_b_wins, "draws": team_b_draws, "losses": team_b_losses},
-                    "performance_analysis": team_b_performance
-                }
-            },
-            "referees": {
-                "main": {"name": main_ref, "info": main_ref_info, "photo": main_ref_photo, "referee_analysis": main_ref_analysis} if main_ref else None,
-                "side": {"name": side_ref, "info": side_ref_info, "photo": side_ref_photo, "referee_analysis": side_ref_analysis} if side_ref else None
-            },
-            "head_to_head": head_to_head_matches
-        }
+        empty_form = ([], 0, 0, 0, {})
+        steps = [
+            Step("team_a_info", lambda r: fetch_team_info(team_a), default={}),
+            Step("team_b_info", lambda r: fetch_team_info(team_b), default={}),
+            Step("main_ref", lambda r: get_referee_stats(main_ref) if main_ref else None),
+            Step("side_ref", lambda r: get_referee_stats(side_ref) if side_ref else None),
+            Step("team_a_form", lambda r: get_team_last_5_matches_with_tactics(team_a), default=empty_form),
+            Step("team_b_form", lambda r: get_team_last_5_matches_with_tactics(team_b), default=empty_form),
+            Step("head_to_head", lambda r: get_last_matches(team_a, team_b), default=[]),
+            # Logo ve fotoğraflar sadece kendi bilgi adımlarını bekler
+            Step("team_a_logo", lambda r: _logo_from_info(r["team_a_info"]), deps=["team_a_info"]),
+            Step("team_b_logo", lambda r: _logo_from_info(r["team_b_info"]), deps=["team_b_info"]),
+            Step("main_ref_photo", lambda r: image_asset_url(r["main_ref"].photo_url if r["main_ref"] else None), deps=["main_ref"]),
+            Step("side_ref_photo", lambda r: image_asset_url(r["side_ref"].photo_url if r["side_ref"] else None), deps=["side_ref"]),
+            # Video diğer adımlarla paralel akar; hata olursa diğer bölümler etkilenmez
+            Step("video", lambda r: analyze_video(youtube_url, team_a, team_b, team_a_jersey, team_b_jersey)
+                 if youtube_url else None),
+        ]
+        done: Dict[str, Any] = {}
+        emitted: List[str] = []
+
+        def step_done(name: str, value: Any) -> None:
+            done[name] = value
+            if on_section is None:
+                return
+            for section, needs in ANALYSIS_SECTIONS.items():
+                if section not in emitted and all(n in done for n in needs):
+                    emitted.append(section)
+                    on_section(section, _section_fragment(section, done, team_a, team_b, main_ref, side_ref))
+
+        res = AnalysisExecutor().run(steps, on_step_done=step_done)
+        summary_data: Dict[str, Any] = {}
+        for section in ANALYSIS_SECTIONS:
+            _deep_merge(summary_data, _section_fragment(section, res, team_a, team_b, main_ref, side_ref))
         return summary_data
-    except Exception as e:
+    except Exception:
         traceback.print_exc()
         raise
 
@@ -156,7 +290,16 @@ def main_analysis(
 
 @app.on_event("startup")
 async def startup_event() -> None:
-    pass
+    # Takım ID/slug deposunu arka planda takimlar.json'dan ısıt
+    if os.environ.get("TEAM_PREWARM", "1") == "1":
+        threading.Thread(target=prewarm_team_store, args=(search_team_url,), daemon=True).start()
+    # Zamanlayıcı takimlar.json/hakemler.json'u bütçe dahilinde sürekli tazeler (hakem deposu ısıtma dahil)
+    if PREFETCH_ENABLED:
+        prefetcher.start()
+    elif os.environ.get("REFEREE_PREWARM", "1") == "1":
+        threading.Thread(target=prewarm_referee_store, args=(fetch_referee_stats,), daemon=True).start()
+    if not FAST_STARTUP:
+        load_vision_stack()
 
 
 @app.get("/")
@@ -169,9 +312,10 @@ async def test() -> Dict[str, str]:
 
 @app.get("/test-fetch")
 async def test_fetch():
-    import requests
     try:
-        r = requests.get("https://www.transfermarkt.com.tr", timeout=30)
+        r = await async_safe_get("https://www.transfermarkt.com.tr", timeout=30, retries=1)
+        if r is None:
+            return {"error": "no response"}
         return {"status": r.status_code}
     except Exception as e:
         import traceback
@@ -188,50 +332,161 @@ async def start_analysis(
     team_a_jersey: Optional[UploadFile] = File(None),
     team_b_jersey: Optional[UploadFile] = File(None)
 ) -> Dict[str, str]:
-    global analysis_running, analysis_thread, analysis_results
-    if analysis_running:
-        raise HTTPException(status_code=400, detail="Analiz zaten çalışıyor")
-    tmp = tempfile.gettempdir()
-    ta_path = tb_path = None
-    if team_a_jersey:
-        filename_a: str = str(team_a_jersey.filename)
-        ta_path = os.path.join(tmp, filename_a)
-        with open(ta_path, 'wb') as f:
-            f.write(await team_a_jersey.read())
-    if team_b_jersey:
-        filename_b: str = str(team_b_jersey.filename)
-        tb_path = os.path.join(tmp, filename_b)
-        with open(tb_path, 'wb') as f:
-            f.write(await team_b_jersey.read())
-    analysis_running = True
-    analysis_results = None
-
-    def run():
-        global analysis_results, analysis_running
+    # Formalar içerik hash'iyle saklanır; analize sadece hash'ler gider
+    try:
+        ta_hash = await jersey_store.save_upload(team_a_jersey) if team_a_jersey else None
+        tb_hash = await jersey_store.save_upload(team_b_jersey) if team_b_jersey else None
+    except JerseyTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    # Aynı maç (ve aynı formalar) için süren analiz varsa ona bağlan
+    prefetcher.note_fixture(team_a, team_b)
+    key = fixture_key(team_a, team_b, (main_ref, side_ref), youtube_url or "", ta_hash or "", tb_hash or "")
+    try:
+        job = analysis_jobs.submit(main_analysis, team_a, team_b, main_ref, side_ref, ta_hash, tb_hash, youtube_url,
+                                   key=key, progress=True)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return {"status": "started", "job_id": job.id}
+
+@app.get("/analysis-status/{job_id}")
+async def analysis_status(job_id: str) -> Any:
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analiz bulunamadı")
+    return job.to_status()
+
+@app.get("/analysis-stream/{job_id}")
+async def analysis_stream(job_id: str) -> StreamingResponse:
+    # Her bölüm hazır oldukça SSE ile gönderilir; son olay "completed" veya "failed"
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analiz bulunamadı")
+
+    async def events():
+        history, queue = job.subscribe()
         try:
-            analysis_results = main_analysis(team_a, team_b, main_ref, side_ref, ta_path, tb_path, youtube_url)
-        except Exception as e:
-            traceback.print_exc()
+            for event, data in history:
+                yield sse_event(event, data)
+                if event in ("completed", "failed"):
+                    return
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield SSE_KEEPALIVE
+                    continue
+                yield sse_event(event, data)
+                if event in ("completed", "failed"):
+                    return
         finally:
-            analysis_running = False
+            job.unsubscribe(queue)
 
-    analysis_thread = threading.Thread(target=run, daemon=True)
-    analysis_thread.start()
-    return {"status": "started"}
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
 
-@app.get("/analysis-status")
-async def analysis_status() -> Any:
-    if analysis_thread and analysis_thread.is_alive():
-        return {"status": "running"}
-    if analysis_results is not None:
-        return {"status": "completed", "results": analysis_results}
-    return {"status": "idle"}
+@app.get("/assets/{asset_hash}")
+async def asset(asset_hash: str) -> FileResponse:
+    # İçerik adresli olduğu için aynı URL'nin içeriği asla değişmez
+    found = image_assets.lookup(asset_hash)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Görsel bulunamadı")
+    path, content_type = found
+    return FileResponse(path, media_type=content_type,
+                        headers={"Cache-Control": "public, max-age=31536000, immutable", "ETag": f'"{asset_hash}"'})
 
 @app.post("/predict-match")
-async def predict_match_endpoint(team_a: str = Form(...), team_b: str = Form(...)) -> Dict[str, str]:
-    prediction = await run_in_threadpool(predict_match, team_a, team_b)
+async def predict_match_endpoint(
+    team_a: str = Form(...),
+    team_b: str = Form(...),
+    use_sir_alex: bool = Form(False),
+    engine: str = Form("llm")
+) -> Dict[str, Any]:
+    prefetcher.note_fixture(team_a, team_b)
+    # engine="poisson": yerel Poisson/Dixon–Coles modeli (ağ ve LLM gerektirmez), varsayılan uzak LLM
+    if engine == "poisson":
+        key = fixture_key(team_a, team_b, (), "predict", "poisson")
+        return await predict_flight.do_async(key, run_in_threadpool, predict_match_local, team_a, team_b)
+    key = fixture_key(team_a, team_b, (), "predict", use_sir_alex)
+    prediction = await predict_flight.do_async(key, predict_match_async, team_a, team_b, use_sir_alex)
     return {"prediction": prediction}
 
+@app.get("/predict-match/stream")
+async def predict_match_stream_endpoint(team_a: str, team_b: str, use_sir_alex: bool = False) -> StreamingResponse:
+    # Modelin ara çıktıları "chunk", sonuç "completed", hata "error" olayı olarak gelir
+    async def events():
+        async for event, value in predict_match_stream(team_a, team_b, use_sir_alex):
+            if event == "generating":
+                yield sse_event("chunk", {"text": value})
+            elif event == "completed":
+                yield sse_event("completed", {"prediction": value})
+            else:
+                yield sse_event("error", {"prediction": value})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+class Fixture(BaseModel):
+    team_a: str
+    team_b: str
+    kickoff: Optional[datetime] = None
+
+
+class MatchdayRequest(BaseModel):
+    fixtures: List[Fixture]
+    use_sir_alex: bool = False
+
+
+@app.post("/predict-matchday")
+async def predict_matchday_endpoint(req: MatchdayRequest) -> StreamingResponse:
+    # Her maçın tahmini bittiği anda "prediction" olayı olarak gönderilir
+    if not req.fixtures:
+        raise HTTPException(status_code=400, detail="Maç listesi boş")
+    fixtures = [(f.team_a, f.team_b) for f in req.fixtures]
+    for f in req.fixtures:
+        prefetcher.note_fixture(f.team_a, f.team_b, f.kickoff.timestamp() if f.kickoff else None)
+
+    async def events():
+        # aclosing: bağlantı kopunca predict_matchday hemen kapanır ve bekleyen tahminleri iptal eder
+        async with aclosing(predict_matchday(fixtures, req.use_sir_alex)) as items:
+            async for item in items:
+                yield sse_event("prediction", item)
+        yield sse_event("completed", {"count": len(fixtures)})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+class UpcomingFixtures(BaseModel):
+    fixtures: List[Fixture]
+
+
+@app.post("/prefetch/fixtures")
+async def prefetch_fixtures_endpoint(req: UpcomingFixtures) -> Dict[str, int]:
+    # Yaklaşan maçlar bildirilir; takımları ve ikili maçları öncelikli tazelenir.
+    # Sadece takimlar.json'daki takımlar kabul edilir: istemci rastgele isim kazıtamaz
+    if len(req.fixtures) > PREFETCH_MAX_FIXTURES_PER_REQUEST:
+        raise HTTPException(status_code=400, detail=f"En fazla {PREFETCH_MAX_FIXTURES_PER_REQUEST} maç gönderilebilir")
+    known = {normalize_team_name(n) for n in load_team_names()}
+    accepted = 0
+    for f in req.fixtures:
+        if known and not (normalize_team_name(f.team_a) in known and normalize_team_name(f.team_b) in known):
+            continue
+        accepted += prefetcher.note_fixture(f.team_a, f.team_b, f.kickoff.timestamp() if f.kickoff else None)
+    return {"accepted": accepted, "rejected": len(req.fixtures) - accepted, "upcoming": len(prefetcher.upcoming())}
+
+@app.get("/upstream-status")
+async def upstream_status_endpoint() -> Dict[str, Any]:
+    # Host başına devre kesici durumu (closed / open / half_open)
+    return host_guard.status()
+
+@app.get("/prefetch/status")
+async def prefetch_status_endpoint() -> Dict[str, Any]:
+    return await run_in_threadpool(prefetcher.status)
+
+@app.post("/prediction-cache/invalidate")
+async def invalidate_prediction_cache(
+    team_a: Optional[str] = Form(None),
+    team_b: Optional[str] = Form(None)
+) -> Dict[str, int]:
+    deleted = await run_in_threadpool(prediction_cache.invalidate, team_a, team_b)
+    return {"invalidated": deleted}
+
 @app.get("/team-info/{team_name}")
 async def team_info_endpoint(team_name: str) -> Any:
     maclar, w, d, l, performance = get_team_last_5_matches_with_tactics(team_name)
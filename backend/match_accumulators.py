@@ -0,0 +1,139 @@
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Video sonuçlarının maç boyunca biriktirilmesi: takım başına sabit boyutlu konum ısı haritası ve
+# sabit sayıda kovadan oluşan bölge/top hakimiyeti zaman serisi. Bellek video uzunluğundan bağımsızdır:
+# kovalar dolunca komşu çiftler birleştirilir ve kova başına kare sayısı ikiye katlanır.
+# Konumlar görüntü koordinatındadır (0-1, saha homografisi yok); oyuncunun ayak noktası kullanılır.
+
+HEATMAP_BINS = (int(os.environ.get("HEATMAP_BINS_X", "24")), int(os.environ.get("HEATMAP_BINS_Y", "16")))
+TIMELINE_BUCKETS = int(os.environ.get("TIMELINE_BUCKETS", "64"))  # çift sayı olmalı
+PLAY_RADIUS = float(os.environ.get("PLAY_RADIUS", "0.15"))  # oyun merkezine bu uzaklıktaki oyuncular
+
+# Zaman serisi kovası sütunları (toplamlar; ortalamalar serileştirirken hesaplanır)
+FRAMES, NEAR_A, NEAR_B, X_SUM_A, N_A, X_SUM_B, N_B, FIRST, LAST = range(9)
+
+
+def foot_points(boxes: np.ndarray, frame_size: Tuple[int, int]) -> np.ndarray:
+    # (N,4) xyxy -> (N,2) normalize ayak noktası (kutunun alt orta noktası)
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    w, h = float(frame_size[0]), float(frame_size[1])
+    pts = np.stack([(boxes[:, 0] + boxes[:, 2]) / 2 / w, boxes[:, 3] / h], axis=1)
+    return np.clip(pts, 0.0, 1.0)
+
+
+class MatchAccumulator:
+    def __init__(self, bins: Tuple[int, int] = HEATMAP_BINS, buckets: int = TIMELINE_BUCKETS,
+                 play_radius: float = PLAY_RADIUS) -> None:
+        self.bins = (max(1, bins[0]), max(1, bins[1]))
+        self.buckets = max(2, buckets + buckets % 2)
+        self.play_radius = play_radius
+        # [takım, y, x] (satır = dikey); sayımlar uint32: 90 dk'lık maçta bile taşmaz
+        self.heat = np.zeros((2, self.bins[1], self.bins[0]), dtype=np.uint32)
+        self.timeline = np.zeros((self.buckets, 9), dtype=np.float64)
+        self.span = 1  # kova başına kare
+        self.used = 0  # dolu kova sayısı
+        self.in_bucket = 0  # son kovadaki kare sayısı
+        self.frames = 0
+        self.unknown = 0
+
+    def _merge(self) -> None:
+        # Komşu kova çiftleri toplanır; ilk/son kare sütunları çiftin ilk ve son karesinden alınır
+        t = self.timeline
+        pairs = t.reshape(self.buckets // 2, 2, 9)
+        merged = pairs.sum(axis=1)
+        merged[:, FIRST] = pairs[:, 0, FIRST]
+        merged[:, LAST] = pairs[:, 1, LAST]
+        t[: self.buckets // 2] = merged
+        t[self.buckets // 2:] = 0
+        self.used = self.buckets // 2
+        self.span *= 2
+
+    def _bucket(self, frame_index: int) -> np.ndarray:
+        if self.used == 0 or self.in_bucket >= self.span:
+            if self.used == self.buckets:
+                self._merge()
+            self.used += 1
+            self.in_bucket = 0
+            self.timeline[self.used - 1, FIRST] = frame_index
+        self.in_bucket += 1
+        row = self.timeline[self.used - 1]
+        row[LAST] = frame_index
+        return row
+
+    def update(self, frame_index: int, points: np.ndarray, teams: Sequence[Optional[int]]) -> None:
+        # points: (N,2) normalize konum, teams: 0 = A, 1 = B, None = bilinmiyor
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        team = np.array([-1 if t is None else t for t in teams], dtype=np.int64)
+        self.frames += 1
+        row = self._bucket(frame_index)
+        row[FRAMES] += 1
+        known = team >= 0
+        self.unknown += int((~known).sum())
+        if not known.any():
+            return
+        pts, team = points[known], team[known]
+        ix = np.minimum((pts[:, 0] * self.bins[0]).astype(np.int64), self.bins[0] - 1)
+        iy = np.minimum((pts[:, 1] * self.bins[1]).astype(np.int64), self.bins[1] - 1)
+        np.add.at(self.heat, (team, iy, ix), 1)
+
+        # Bölge: takımların ortalama yatay konumu. Hakimiyet vekili: tüm oyuncuların ağırlık
+        # merkezine (oyunun/topun bulunduğu bölge) yakın oyuncuların takım payı
+        a, b = team == 0, team == 1
+        row[X_SUM_A] += pts[a, 0].sum()
+        row[N_A] += a.sum()
+        row[X_SUM_B] += pts[b, 0].sum()
+        row[N_B] += b.sum()
+        near = np.hypot(*(pts - pts.mean(axis=0)).T) <= self.play_radius
+        row[NEAR_A] += (near & a).sum()
+        row[NEAR_B] += (near & b).sum()
+
+    @staticmethod
+    def _share(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        total = a + b
+        return np.where(total > 0, a / np.maximum(total, 1), np.nan)
+
+    def possession(self) -> Optional[float]:
+        t = self.timeline[: self.used]
+        total = t[:, NEAR_A].sum() + t[:, NEAR_B].sum()
+        return float(t[:, NEAR_A].sum() / total) if total else None
+
+    def to_dict(self, team_names: Tuple[str, str]) -> Dict[str, Any]:
+        # Kompakt çıktı: ısı haritaları 0-255 tamsayıya ölçeklenir (tek takım içinde en yoğun hücre = 255),
+        # zaman serisi sadece dolu kovaları, yuvarlanmış paylarla içerir
+        heatmaps = {}
+        for i, name in enumerate(team_names):
+            grid = self.heat[i]
+            peak = int(grid.max())
+            scaled = (grid * (255.0 / peak)).round().astype(np.uint8) if peak else grid.astype(np.uint8)
+            heatmaps[name] = {"samples": int(grid.sum()), "peak": peak, "grid": scaled.tolist()}
+
+        t = self.timeline[: self.used]
+        share = self._share(t[:, NEAR_A], t[:, NEAR_B])
+        mean_a = np.where(t[:, N_A] > 0, t[:, X_SUM_A] / np.maximum(t[:, N_A], 1), np.nan)
+        mean_b = np.where(t[:, N_B] > 0, t[:, X_SUM_B] / np.maximum(t[:, N_B], 1), np.nan)
+
+        def col(values: np.ndarray) -> List[Optional[float]]:
+            return [None if np.isnan(v) else round(float(v), 3) for v in values]
+
+        possession = self.possession()
+        return {
+            "bins": list(self.bins),
+            "frames": self.frames,
+            "unknown_detections": self.unknown,
+            "heatmaps": heatmaps,
+            "possession": {team_names[0]: round(possession, 3), team_names[1]: round(1 - possession, 3)}
+            if possession is not None else None,
+            "timeline": {
+                "frames_per_bucket": self.span,
+                "start_frame": [int(v) for v in t[:, FIRST]],
+                "end_frame": [int(v) for v in t[:, LAST]],
+                "possession": {team_names[0]: col(share), team_names[1]: col(1 - share)},
+                "mean_x": {team_names[0]: col(mean_a), team_names[1]: col(mean_b)},
+            },
+        }
+
+    def nbytes(self) -> int:
+        return int(self.heat.nbytes + self.timeline.nbytes)
@@ -0,0 +1,72 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from analysis_executor import AnalysisExecutor, Step
+from gpt_area import (
+    get_last_matches,
+    get_team_last_5_matches_with_tactics,
+    predict_prompt_async,
+    prepare_the_prompt,
+)
+from team_store import normalize_team_name
+
+# Bir haftanın (matchday) tüm maçları için toplu tahmin.
+# Her takımın formu ve her eşleşmenin h2h'ı bir kez, paralel çekilir;
+# uzak çıkarım sınırlı eşzamanlılıkla yapılır ve sonuçlar bittikçe döner.
+
+MATCHDAY_INFERENCE_CONCURRENCY = int(os.environ.get("MATCHDAY_INFERENCE_CONCURRENCY", "3"))
+
+
+def build_matchday_prompts(fixtures: List[Tuple[str, str]]) -> List[str]:
+    teams: Dict[str, str] = {}
+    for team_a, team_b in fixtures:
+        teams.setdefault(normalize_team_name(team_a), team_a)
+        teams.setdefault(normalize_team_name(team_b), team_b)
+    pairs = {(normalize_team_name(a), normalize_team_name(b)): (a, b) for a, b in fixtures}
+
+    empty_form = ([], 0, 0, 0, {})
+    steps = [Step(f"form:{key}", lambda r, name=name: get_team_last_5_matches_with_tactics(name), default=empty_form)
+             for key, name in teams.items()]
+    steps += [Step(f"h2h:{ka}|{kb}", lambda r, a=a, b=b: get_last_matches(a, b), default=[])
+              for (ka, kb), (a, b) in pairs.items()]
+    res = AnalysisExecutor().run(steps)
+
+    prompts = []
+    for team_a, team_b in fixtures:
+        ka, kb = normalize_team_name(team_a), normalize_team_name(team_b)
+        maclar_a, wins_a, draws_a, losses_a, _ = res[f"form:{ka}"]
+        maclar_b, wins_b, draws_b, losses_b, _ = res[f"form:{kb}"]
+        prompts.append(prepare_the_prompt(
+            res[f"h2h:{ka}|{kb}"],
+            team_a, maclar_a, wins_a, draws_a, losses_a,
+            team_b, maclar_b, wins_b, draws_b, losses_b
+        ))
+    return prompts
+
+
+async def predict_matchday(fixtures: List[Tuple[str, str]], use_sir_alex: bool = False,
+                           concurrency: int = MATCHDAY_INFERENCE_CONCURRENCY) -> AsyncIterator[Dict[str, Any]]:
+    prompts = await asyncio.to_thread(build_matchday_prompts, fixtures)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> Dict[str, Any]:
+        team_a, team_b = fixtures[index]
+        async with sem:
+            try:
+                prediction = await predict_prompt_async(prompts[index], team_a, team_b, use_sir_alex)
+            except Exception as e:
+                prediction = f"[ERROR] {e}"
+        return {"index": index, "team_a": team_a, "team_b": team_b, "prediction": prediction}
+
+    tasks = [asyncio.ensure_future(one(i)) for i in range(len(fixtures))]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # İstemci koptuğunda (üreteç kapatılınca) kalan çıkarımlar boşuna sürmesin
+        pending = [t for t in tasks if not t.done()]
+        for t in pending:
+            t.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,136 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import cv2
+import numpy as np
+
+# GPU gerektirmeyen oyuncu dedektörü: çim rengi maskesi + morfoloji + bağlı bileşenler.
+# Çıktı ultralytics ile uyumlu: .xyxy (N,4) dizi, üzerinde gezinince box.xyxy[0] veren Box nesneleri.
+# Dedektörler DETECTORS kaydından seçilir (PLAYER_DETECTOR); daha ağır bir model aynı arayüzle eklenebilir.
+
+PLAYER_DETECTOR = os.environ.get("PLAYER_DETECTOR", "pitch")
+DETECTOR_PROC_WIDTH = int(os.environ.get("DETECTOR_PROC_WIDTH", "640"))  # maske bu genişlikte hesaplanır
+
+# Saha çimi için HSV aralığı
+GRASS_LOWER = np.array([35, 40, 40], dtype=np.uint8)
+GRASS_UPPER = np.array([85, 255, 255], dtype=np.uint8)
+
+
+class Box:
+    # ultralytics Boxes elemanı gibi: box.xyxy[0] -> [x1, y1, x2, y2]
+    __slots__ = ("xyxy", "conf", "cls")
+
+    def __init__(self, xyxy: np.ndarray, conf: float = 1.0, cls: int = 0) -> None:
+        self.xyxy = np.asarray(xyxy, dtype=np.float32).reshape(1, 4)
+        self.conf = conf
+        self.cls = cls
+
+    def __repr__(self) -> str:
+        return f"Box({self.xyxy[0].tolist()}, conf={self.conf:.2f})"
+
+
+class Detections:
+    def __init__(self, xyxy: np.ndarray, conf: Optional[np.ndarray] = None,
+                 meta: Optional[Dict[str, Any]] = None) -> None:
+        self.xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        self.conf = np.ones(len(self.xyxy), np.float32) if conf is None else np.asarray(conf, np.float32)
+        self.meta = meta or {}
+
+    def __len__(self) -> int:
+        return len(self.xyxy)
+
+    def __iter__(self) -> Iterator[Box]:
+        for row, c in zip(self.xyxy, self.conf):
+            yield Box(row, float(c))
+
+    def __getitem__(self, i: int) -> Box:
+        return Box(self.xyxy[i], float(self.conf[i]))
+
+
+class PlayerDetector(ABC):
+    name = "base"
+
+    @abstractmethod
+    def detect(self, frame: np.ndarray, hsv: Optional[np.ndarray] = None) -> Detections:
+        # hsv: karenin HSV'si başka bir adımda hesaplandıysa verilir
+        ...
+
+
+class PitchSegmentationDetector(PlayerDetector):
+    name = "pitch"
+
+    def __init__(self, proc_width: int = DETECTOR_PROC_WIDTH, min_area: float = 0.00012, max_area: float = 0.02,
+                 min_aspect: float = 0.8, max_aspect: float = 4.5, min_fill: float = 0.25) -> None:
+        self.proc_width = proc_width
+        # Alanlar işlenen karenin alanına oranla (çözünürlükten bağımsız)
+        self.min_area = min_area
+        self.max_area = max_area
+        self.min_aspect = min_aspect  # yükseklik / genişlik
+        self.max_aspect = max_aspect
+        self.min_fill = min_fill
+        self._open = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+        self._join = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 7))
+
+    def pitch_mask(self, grass: np.ndarray) -> np.ndarray:
+        # Tribün/skorbord dışarıda kalsın: en büyük çim bölgesinin dışbükey zarfı saha kabul edilir
+        k = max(5, grass.shape[1] // 40) | 1
+        closed = cv2.morphologyEx(grass, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (k, k)))
+        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        field = np.zeros_like(grass)
+        if contours:
+            cv2.fillConvexPoly(field, cv2.convexHull(max(contours, key=cv2.contourArea)), 255)
+        return field
+
+    def detect(self, frame: np.ndarray, hsv: Optional[np.ndarray] = None) -> Detections:
+        h, w = frame.shape[:2]
+        if hsv is None:
+            hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        scale = 1.0
+        if self.proc_width and w > self.proc_width:
+            scale = w / self.proc_width
+            # Ton dairesel olduğu için ara değerleme yapılmaz (INTER_NEAREST)
+            hsv = cv2.resize(hsv, (self.proc_width, int(round(h / scale))), interpolation=cv2.INTER_NEAREST)
+        grass = cv2.inRange(hsv, GRASS_LOWER, GRASS_UPPER)
+        green_ratio = float(cv2.countNonZero(grass)) / grass.size
+        field = self.pitch_mask(grass)
+
+        # Saha içindeki çim olmayan pikseller: oyuncular, top, çizgiler. İnce çizgiler açma ile silinir,
+        # dikey kapama forma/şort/bacak parçalarını tek bileşende birleştirir
+        fg = cv2.bitwise_and(field, cv2.bitwise_not(grass))
+        fg = cv2.morphologyEx(fg, cv2.MORPH_OPEN, self._open)
+        fg = cv2.morphologyEx(fg, cv2.MORPH_CLOSE, self._join)
+        n, _, stats, _ = cv2.connectedComponentsWithStats(fg, connectivity=8)
+        meta = {"green_ratio": green_ratio, "field_ratio": float(cv2.countNonZero(field)) / field.size}
+        if n <= 1:
+            return Detections(np.zeros((0, 4)), meta=meta)
+
+        s = stats[1:].astype(np.float64)
+        x, y, bw, bh, area = s[:, 0], s[:, 1], s[:, 2], s[:, 3], s[:, 4]
+        frame_area = float(fg.size)
+        aspect = bh / np.maximum(bw, 1)
+        fill = area / np.maximum(bw * bh, 1)
+        keep = ((area >= self.min_area * frame_area) & (area <= self.max_area * frame_area)
+                & (aspect >= self.min_aspect) & (aspect <= self.max_aspect) & (fill >= self.min_fill))
+        xyxy = np.stack([x, y, x + bw, y + bh], axis=1)[keep] * scale
+        xyxy[:, [0, 2]] = np.clip(xyxy[:, [0, 2]], 0, w)
+        xyxy[:, [1, 3]] = np.clip(xyxy[:, [1, 3]], 0, h)
+        # Güven: dolu oran ve oyuncu en-boy oranına (~2.2) yakınlık
+        conf = np.clip(fill[keep], 0, 1) * np.exp(-np.abs(np.log(aspect[keep] / 2.2)))
+        return Detections(xyxy, conf, meta)
+
+
+DETECTORS: Dict[str, Callable[[], PlayerDetector]] = {
+    "pitch": PitchSegmentationDetector,
+}
+
+
+def register_detector(name: str, factory: Callable[[], PlayerDetector]) -> None:
+    DETECTORS[name] = factory
+
+
+def get_detector(name: Optional[str] = None) -> PlayerDetector:
+    name = name or PLAYER_DETECTOR
+    if name not in DETECTORS:
+        raise ValueError(f"Bilinmeyen dedektör: {name} (mevcut: {', '.join(DETECTORS)})")
+    return DETECTORS[name]()
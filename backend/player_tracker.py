@@ -0,0 +1,240 @@
+import heapq
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Kareler arası oyuncu takibi (saf NumPy): IoU + merkez uzaklığı ile eşleştirme, sabit hızlı
+# alpha-beta (Kalman benzeri) hareket tahmini. Her iz takımını önbellekte tutar; renk sadece
+# her TRACK_RECOLOR_EVERY karede bir ya da güven düştüğünde yeniden sınıflandırılır.
+# Kazanç sınıflandırma/model güncelleme tarafındadır: kutu HSV ortalamaları işçilerde her kutu için
+# yine hesaplanır (izleme ana süreçte, işçilerden sonra çalışır; işçi hangi izin kararlı olduğunu bilmez).
+
+TRACK_IOU_WEIGHT = 1.0
+TRACK_MAX_DISTANCE = float(os.environ.get("TRACK_MAX_DISTANCE", "0.08"))  # kare köşegenine oranla eşleşme sınırı
+TRACK_MAX_MISSES = int(os.environ.get("TRACK_MAX_MISSES", "8"))  # bu kadar analiz karesinde görülmeyen iz silinir
+TRACK_RECOLOR_EVERY = int(os.environ.get("TRACK_RECOLOR_EVERY", "10"))  # analiz edilen kare sayısı cinsinden
+TRACK_MIN_TEAM_CONF = float(os.environ.get("TRACK_MIN_TEAM_CONF", "0.25"))
+TRACK_MIN_HITS = int(os.environ.get("TRACK_MIN_HITS", "3"))  # çıktıya girmek için en az görülme
+# Biten izlerden en uzun görülen bu kadarı saklanır (bellek video uzunluğundan bağımsız)
+TRACK_MAX_FINISHED = int(os.environ.get("TRACK_MAX_FINISHED", "200"))
+ALPHA, BETA = 0.6, 0.2
+
+
+@dataclass
+class Track:
+    id: int
+    box: np.ndarray  # x1, y1, x2, y2
+    velocity: np.ndarray = field(default_factory=lambda: np.zeros(2))  # merkez, piksel / kare
+    first_frame: int = 0
+    last_frame: int = 0
+    hits: int = 1
+    misses: int = 0
+    team: Optional[int] = None  # 0 = A, 1 = B
+    team_conf: float = 0.0
+    color_frame: int = -1  # son renk sınıflandırmasının yapıldığı güncelleme sayısı
+    hsv: Optional[np.ndarray] = None  # izin forma renginin kayan ortalaması
+    distance: float = 0.0  # piksel
+    position_sum: np.ndarray = field(default_factory=lambda: np.zeros(2))
+
+    @property
+    def center(self) -> np.ndarray:
+        return np.array([(self.box[0] + self.box[2]) / 2, (self.box[1] + self.box[3]) / 2])
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # (T,4) x (N,4) -> (T,N)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def greedy_match(cost: np.ndarray, max_cost: float) -> List[Tuple[int, int]]:
+    # En düşük maliyetli çiftten başlayarak açgözlü eşleştirme (Hungarian yerine, az oyuncu için yeterli)
+    if cost.size == 0:
+        return []
+    order = np.argsort(cost, axis=None)
+    rows, cols = np.unravel_index(order, cost.shape)
+    used_r, used_c = set(), set()
+    pairs = []
+    for r, c in zip(rows.tolist(), cols.tolist()):
+        if cost[r, c] > max_cost:
+            break
+        if r in used_r or c in used_c:
+            continue
+        used_r.add(r)
+        used_c.add(c)
+        pairs.append((r, c))
+    return pairs
+
+
+class PlayerTracker:
+    def __init__(self, max_distance: float = TRACK_MAX_DISTANCE, max_misses: int = TRACK_MAX_MISSES,
+                 recolor_every: int = TRACK_RECOLOR_EVERY, min_team_conf: float = TRACK_MIN_TEAM_CONF,
+                 min_hits: int = TRACK_MIN_HITS, max_finished: int = TRACK_MAX_FINISHED) -> None:
+        self.max_distance = max_distance
+        self.max_misses = max_misses
+        self.recolor_every = recolor_every
+        self.min_team_conf = min_team_conf
+        self.min_hits = min_hits
+        self.max_finished = max(0, max_finished)
+        self.tracks: List[Track] = []
+        # (görülme, id, iz) min-yığını: dolunca en az görülen iz atılır
+        self.finished: List[Tuple[int, int, Track]] = []
+        self.dropped = 0
+        self.next_id = 1
+        self.updates = 0
+        self.last_frame: Optional[int] = None
+        self.frame_size = (1.0, 1.0)
+        self.diag = 1.0
+        self.color_requests = 0
+        self.detections_seen = 0
+
+    def _finish(self, t: Track) -> None:
+        # Kısa izler (gürültü, kesmeden sonra kopan izler) çıktıya girmeyeceği için hemen atılır
+        if t.hits < self.min_hits or not self.max_finished:
+            self.dropped += 1
+            return
+        entry = (t.hits, t.id, t)
+        if len(self.finished) < self.max_finished:
+            heapq.heappush(self.finished, entry)
+        else:
+            heapq.heappushpop(self.finished, entry)
+            self.dropped += 1
+
+    def _predicted_boxes(self, dt: float) -> np.ndarray:
+        if not self.tracks:
+            return np.zeros((0, 4))
+        boxes = np.stack([t.box for t in self.tracks])
+        shift = np.stack([t.velocity for t in self.tracks]) * dt
+        return boxes + np.concatenate([shift, shift], axis=1)
+
+    def update(self, boxes: np.ndarray, frame_index: int,
+               frame_size: Optional[Tuple[int, int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        # Dönen: her kutunun iz ID'si ve rengi yeniden sınıflandırılması gereken kutuların maskesi
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        if frame_size:
+            self.frame_size = (float(frame_size[0]), float(frame_size[1]))
+            self.diag = float(np.hypot(*frame_size))
+        dt = float(frame_index - self.last_frame) if self.last_frame is not None else 1.0
+        self.last_frame = frame_index
+        self.updates += 1
+        self.detections_seen += len(boxes)
+
+        pred = self._predicted_boxes(dt)
+        matches: List[Tuple[int, int]] = []
+        if len(pred) and len(boxes):
+            iou = iou_matrix(pred, boxes)
+            pc = (pred[:, :2] + pred[:, 2:]) / 2
+            bc = (boxes[:, :2] + boxes[:, 2:]) / 2
+            dist = np.sqrt(((pc[:, None, :] - bc[None, :, :]) ** 2).sum(axis=2)) / self.diag
+            # Örneklemeden dolayı kutular çakışmayabilir: IoU yoksa merkez uzaklığı belirleyicidir
+            cost = TRACK_IOU_WEIGHT * (1 - iou) + dist / self.max_distance
+            cost[dist > self.max_distance] = np.inf
+            matches = greedy_match(cost, max_cost=TRACK_IOU_WEIGHT + 1.0)
+
+        ids = np.zeros(len(boxes), dtype=np.int64)
+        needs_color = np.zeros(len(boxes), dtype=bool)
+        matched_tracks = set()
+        for ti, di in matches:
+            t = self.tracks[ti]
+            pc = (pred[ti, :2] + pred[ti, 2:]) / 2
+            mc = (boxes[di, :2] + boxes[di, 2:]) / 2
+            r = mc - pc
+            new_center = pc + ALPHA * r
+            t.velocity = t.velocity + BETA * r / max(dt, 1.0)
+            t.distance += float(np.hypot(*(new_center - t.center)))
+            half = (boxes[di, 2:] - boxes[di, :2]) / 2
+            t.box = np.concatenate([new_center - half, new_center + half])
+            t.hits += 1
+            t.misses = 0
+            t.last_frame = frame_index
+            t.position_sum += new_center
+            matched_tracks.add(ti)
+            ids[di] = t.id
+            needs_color[di] = (t.team is None or t.team_conf < self.min_team_conf
+                               or self.updates - t.color_frame >= self.recolor_every)
+
+        matched_dets = {di for _, di in matches}
+        for di in range(len(boxes)):
+            if di in matched_dets:
+                continue
+            t = Track(self.next_id, boxes[di].copy(), first_frame=frame_index, last_frame=frame_index)
+            t.position_sum = t.center.copy()
+            self.next_id += 1
+            self.tracks.append(t)
+            ids[di] = t.id
+            needs_color[di] = True
+
+        alive = []
+        for i, t in enumerate(self.tracks):
+            if i not in matched_tracks and t.last_frame != frame_index:
+                t.misses += 1
+            if t.misses > self.max_misses:
+                self._finish(t)
+            else:
+                alive.append(t)
+        self.tracks = alive
+        self.color_requests += int(needs_color.sum())
+        return ids, needs_color
+
+    def set_colors(self, ids: np.ndarray, hsv_values: np.ndarray,
+                   classify: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]) -> None:
+        # Yeni renk örnekleri izin kayan ortalamasına katılır; takım bu ortalamadan (tek karelik
+        # gölge/örtüşme gürültüsünden daha kararlı) tek bir toplu çağrıyla belirlenir
+        by_id = {t.id: t for t in self.tracks}
+        updated = []
+        for tid, hsv in zip(ids.tolist(), np.asarray(hsv_values, dtype=np.float64).reshape(-1, 3)):
+            t = by_id.get(tid)
+            if t is None or not hsv.any():
+                continue
+            t.hsv = hsv.copy() if t.hsv is None else 0.7 * t.hsv + 0.3 * hsv
+            t.color_frame = self.updates
+            updated.append(t)
+        if not updated:
+            return
+        labels, conf = classify(np.stack([t.hsv for t in updated]))
+        for t, label, c in zip(updated, labels.tolist(), conf.tolist()):
+            t.team, t.team_conf = (int(label), float(c)) if label >= 0 else (None, 0.0)
+
+    def team_of(self, ids: np.ndarray) -> List[Optional[int]]:
+        by_id = {t.id: t.team for t in self.tracks}
+        return [by_id.get(tid) for tid in ids.tolist()]
+
+    def players(self, team_names: Tuple[str, str], min_hits: Optional[int] = None) -> List[Dict[str, Any]]:
+        # İz başına çıktı: takım, görülme, kat edilen mesafe (kare genişliği cinsinden), ortalama konum (0-1)
+        min_hits = self.min_hits if min_hits is None else min_hits
+        out = []
+        for t in [e[2] for e in self.finished] + self.tracks:
+            if t.hits < min_hits:
+                continue
+            mean = t.position_sum / t.hits
+            out.append({
+                "track_id": t.id,
+                "team": team_names[t.team] if t.team is not None else "Unknown",
+                "team_confidence": round(t.team_conf, 3),
+                "first_frame": t.first_frame,
+                "last_frame": t.last_frame,
+                "frames_seen": t.hits,
+                "distance": round(t.distance / self.frame_size[0], 4),
+                "mean_position": [round(float(mean[0]) / self.frame_size[0], 4), round(float(mean[1]) / self.frame_size[1], 4)],
+            })
+        return sorted(out, key=lambda p: -p["frames_seen"])
+
+    def stats(self) -> Dict[str, Any]:
+        seen = max(self.detections_seen, 1)
+        return {
+            "tracks_total": self.next_id - 1,
+            "tracks_active": len(self.tracks),
+            "tracks_dropped": self.dropped,
+            "detections": self.detections_seen,
+            "color_classifications": self.color_requests,
+            # Yeniden sınıflandırılmadan önbellekteki takımı kullanılan kutu oranı
+            "color_reuse_ratio": round(1 - self.color_requests / seen, 3),
+        }
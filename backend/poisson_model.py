@@ -0,0 +1,217 @@
+import math
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from html_parsing import temizle_takim_adi
+from team_store import normalize_team_name
+
+# Uzak LLM'e alternatif yerel tahmin: Poisson gol modeli + Dixon–Coles düşük skor düzeltmesi.
+# fetch_matches kayıtlarıyla (skor, rakip, iç saha) NumPy üzerinde milisaniyeler içinde fit edilir,
+# ağ gerektirmez. Her takım için hücum/savunma gücü, ortak ev avantajı ve rho tahmin edilir.
+
+MAX_GOALS = 10
+POISSON_DECAY = float(os.environ.get("POISSON_DECAY", "0.002"))  # gün başına zaman ağırlığı azalması
+POISSON_PRIOR = float(os.environ.get("POISSON_PRIOR", "2.0"))  # az maçı olan takımları ortalamaya çeken sözde maç sayısı
+POISSON_ITERATIONS = 60
+RHO_GRID = np.linspace(-0.25, 0.25, 51)
+DATE_RE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{2,4})")
+
+
+@dataclass
+class MatchRecord:
+    home: str
+    away: str
+    home_goals: int
+    away_goals: int
+    date: Optional[datetime] = None
+
+
+def _parse_date(text: str) -> Optional[datetime]:
+    m = DATE_RE.search(text or "")
+    if not m:
+        return None
+    d, mo, y = (int(x) for x in m.groups())
+    if y < 100:
+        y += 2000
+    try:
+        return datetime(y, mo, d)
+    except ValueError:
+        return None
+
+
+def records_from_fixtures(team_name: str, rows: Iterable[Dict[str, Any]]) -> List[MatchRecord]:
+    # Fikstür skoru her zaman "ev sahibi:deplasman" sırasındadır; "ev" bayrağı takımın tarafını verir
+    own = normalize_team_name(team_name)
+    out: List[MatchRecord] = []
+    for row in rows:
+        parts = (row.get("sonuc") or "").split(":")
+        if len(parts) != 2:
+            continue
+        try:
+            hg, ag = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue
+        opp = normalize_team_name(temizle_takim_adi(row.get("rakip") or ""))
+        if not opp:
+            continue
+        home, away = (own, opp) if row.get("ev", True) else (opp, own)
+        out.append(MatchRecord(home, away, hg, ag, _parse_date(row.get("tarih", ""))))
+    return out
+
+
+def dedupe_records(records: Iterable[MatchRecord]) -> List[MatchRecord]:
+    # İki takımın listesinde ortak geçen maç (aralarındaki karşılaşma) bir kez sayılır
+    seen = set()
+    out = []
+    for r in records:
+        key = (r.home, r.away, r.date or (r.home_goals, r.away_goals))
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(r)
+    return out
+
+
+def _dc_tau(hg: np.ndarray, ag: np.ndarray, lam: np.ndarray, mu: np.ndarray, rho: float) -> np.ndarray:
+    tau = np.ones_like(lam)
+    tau = np.where((hg == 0) & (ag == 0), 1 - lam * mu * rho, tau)
+    tau = np.where((hg == 0) & (ag == 1), 1 + lam * rho, tau)
+    tau = np.where((hg == 1) & (ag == 0), 1 + mu * rho, tau)
+    tau = np.where((hg == 1) & (ag == 1), 1 - rho, tau)
+    return tau
+
+
+class PoissonModel:
+    def __init__(self, decay: float = POISSON_DECAY, prior: float = POISSON_PRIOR) -> None:
+        self.decay = decay
+        self.prior = prior
+        self.teams: Dict[str, int] = {}
+        self.attack = np.zeros(0)
+        self.defence = np.zeros(0)
+        self.base = 0.0
+        self.home_adv = 0.0
+        self.rho = 0.0
+        self.matches_used = 0
+
+    def fit(self, records: List[MatchRecord]) -> "PoissonModel":
+        records = dedupe_records(records)
+        self.matches_used = len(records)
+        names = sorted({r.home for r in records} | {r.away for r in records})
+        self.teams = {n: i for i, n in enumerate(names)}
+        n_teams = len(names)
+        self.attack = np.zeros(n_teams)
+        self.defence = np.zeros(n_teams)
+        if not records:
+            return self
+
+        home = np.array([self.teams[r.home] for r in records])
+        away = np.array([self.teams[r.away] for r in records])
+        hg = np.array([r.home_goals for r in records], dtype=float)
+        ag = np.array([r.away_goals for r in records], dtype=float)
+        dates = [r.date for r in records]
+        known = [d for d in dates if d is not None]
+        if self.decay and known:
+            latest = max(known)
+            age = np.array([(latest - d).days if d is not None else 0 for d in dates], dtype=float)
+            w = np.exp(-self.decay * age)
+        else:
+            w = np.ones(len(records))
+
+        # Her maç iki gözlem: ev sahibinin golü ve deplasmanın golü
+        att_idx = np.concatenate([home, away])
+        def_idx = np.concatenate([away, home])
+        is_home = np.concatenate([np.ones(len(records)), np.zeros(len(records))])
+        goals = np.concatenate([hg, ag])
+        ww = np.concatenate([w, w])
+        wg = ww * goals
+        mean_goals = max(wg.sum() / ww.sum(), 1e-6)
+        prior = self.prior * mean_goals
+
+        base = math.log(mean_goals)
+        home_adv = 0.0
+        att = np.zeros(n_teams)
+        dfn = np.zeros(n_teams)
+
+        def rate() -> np.ndarray:
+            return np.exp(base + home_adv * is_home + att[att_idx] + dfn[def_idx])
+
+        # Poisson log-lineer modeli için çarpımsal (IPF) güncellemeler; önsel sözde maçlar küçültme sağlar
+        for _ in range(POISSON_ITERATIONS):
+            lam = ww * rate()
+            att += np.log((np.bincount(att_idx, wg, n_teams) + prior) / (np.bincount(att_idx, lam, n_teams) + prior))
+            att -= att.mean()
+            lam = ww * rate()
+            dfn += np.log((np.bincount(def_idx, wg, n_teams) + prior) / (np.bincount(def_idx, lam, n_teams) + prior))
+            dfn -= dfn.mean()
+            lam = ww * rate()
+            h = is_home == 1
+            home_adv += math.log(max(wg[h].sum(), 1e-6) / max(lam[h].sum(), 1e-6))
+            lam = ww * rate()
+            base += math.log(wg.sum() / lam.sum())
+
+        self.attack, self.defence, self.base, self.home_adv = att, dfn, base, home_adv
+
+        # Dixon–Coles rho: sadece 0-0, 0-1, 1-0, 1-1 skorlarını etkiler; ızgara üzerinde en iyi olabilirlik
+        lam_h = np.exp(base + home_adv + att[home] + dfn[away])
+        lam_a = np.exp(base + att[away] + dfn[home])
+        best, best_ll = 0.0, -np.inf
+        for rho in RHO_GRID:
+            tau = _dc_tau(hg, ag, lam_h, lam_a, rho)
+            if np.any(tau <= 0):
+                continue
+            ll = float(np.sum(w * np.log(tau)))
+            if ll > best_ll:
+                best, best_ll = round(float(rho), 3), ll
+        self.rho = best
+        return self
+
+    def expected_goals(self, team_a: str, team_b: str, home_advantage: bool = True) -> Tuple[float, float]:
+        # Veride olmayan takım lig ortalaması (güç 0) kabul edilir
+        ia, ib = self.teams.get(normalize_team_name(team_a)), self.teams.get(normalize_team_name(team_b))
+        att_a = self.attack[ia] if ia is not None else 0.0
+        def_a = self.defence[ia] if ia is not None else 0.0
+        att_b = self.attack[ib] if ib is not None else 0.0
+        def_b = self.defence[ib] if ib is not None else 0.0
+        adv = self.home_adv if home_advantage else 0.0
+        return math.exp(self.base + adv + att_a + def_b), math.exp(self.base + att_b + def_a)
+
+    def score_matrix(self, team_a: str, team_b: str, home_advantage: bool = True) -> np.ndarray:
+        lam_a, lam_b = self.expected_goals(team_a, team_b, home_advantage)
+        k = np.arange(MAX_GOALS + 1)
+        log_fact = np.concatenate([[0.0], np.cumsum(np.log(k[1:]))])
+        pa = np.exp(k * math.log(lam_a) - lam_a - log_fact)
+        pb = np.exp(k * math.log(lam_b) - lam_b - log_fact)
+        mat = np.outer(pa, pb)
+        mat[0, 0] *= 1 - lam_a * lam_b * self.rho
+        mat[0, 1] *= 1 + lam_a * self.rho
+        mat[1, 0] *= 1 + lam_b * self.rho
+        mat[1, 1] *= 1 - self.rho
+        mat = np.clip(mat, 0, None)
+        return mat / mat.sum()
+
+    def predict(self, team_a: str, team_b: str, home_advantage: bool = True, top: int = 5) -> Dict[str, Any]:
+        mat = self.score_matrix(team_a, team_b, home_advantage)
+        lam_a, lam_b = self.expected_goals(team_a, team_b, home_advantage)
+        i, j = np.indices(mat.shape)
+        order = np.argsort(mat, axis=None)[::-1][:top]
+        return {
+            "expected_goals": [round(lam_a, 3), round(lam_b, 3)],
+            "outcome": {
+                "1": float(mat[i > j].sum()),
+                "X": float(np.trace(mat)),
+                "2": float(mat[i < j].sum()),
+            },
+            "over_2_5": float(mat[i + j > 2].sum()),
+            "btts": float(mat[1:, 1:].sum()),
+            "top_scores": [
+                {"score": f"{a}:{b}", "p": float(mat[a, b])}
+                for a, b in zip(*np.unravel_index(order, mat.shape))
+            ],
+            "rho": self.rho,
+            "matches_used": self.matches_used,
+        }
@@ -0,0 +1,73 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Optional
+
+from storage import connect
+from team_store import normalize_team_name
+
+# Uzak LLM tahminleri için kalıcı önbellek.
+# Anahtar: model adı + prepare_the_prompt çıktısının hash'i; girdi değişmediyse tahmin tekrar istenmez.
+
+PREDICTION_CACHE_TTL = float(os.environ.get("PREDICTION_CACHE_TTL", str(12 * 3600)))
+
+
+def prediction_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+class PredictionCache:
+    def __init__(self, db_name: str = "predictions.sqlite3", ttl: float = PREDICTION_CACHE_TTL) -> None:
+        self._db_name = db_name
+        self.ttl = ttl
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self._db_name)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                " key TEXT PRIMARY KEY, model TEXT, team_a TEXT, team_b TEXT,"
+                " prediction TEXT, created_at REAL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT prediction, created_at FROM predictions WHERE key = ?", (prediction_key(model, prompt),)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return row[0]
+
+    def put(self, model: str, prompt: str, team_a: str, team_b: str, prediction: str) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO predictions (key, model, team_a, team_b, prediction, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (prediction_key(model, prompt), model, normalize_team_name(team_a), normalize_team_name(team_b),
+                 prediction, time.time()),
+            )
+            db.commit()
+
+    def invalidate(self, team_a: Optional[str] = None, team_b: Optional[str] = None) -> int:
+        # Takım verilmezse tüm önbellek; tek takım verilirse o takımın geçtiği tüm maçlar silinir
+        clauses, params = [], []
+        for team in (team_a, team_b):
+            if team:
+                clauses.append("(team_a = ? OR team_b = ?)")
+                params += [normalize_team_name(team)] * 2
+        sql = "DELETE FROM predictions" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        with self._lock:
+            db = self._db()
+            deleted = db.execute(sql, params).rowcount
+            db.commit()
+        return deleted
+
+
+prediction_cache = PredictionCache()
@@ -0,0 +1,232 @@
+import heapq
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from http_client import revalidate
+from referee_store import REFEREE_STATS_TTL, load_referee_names
+from storage import connect
+from team_store import load_team_names, normalize_team_name
+
+# Arka planda takım bilgisi, fikstür, ikili maçlar ve hakem istatistiklerini talepten önce tazeler.
+# Öncelik: bayatlık oranı (geçen süre / yenileme aralığı); yaklaşan maçlardaki takımlar ve eşleşmeler
+# daha erken ve önce yenilenir. Tüm iş, saatlik global bir istek bütçesiyle (token bucket) sınırlanır.
+
+PREFETCH_ENABLED = os.environ.get("PREFETCH", "1") == "1"
+PREFETCH_BUDGET_PER_HOUR = float(os.environ.get("PREFETCH_BUDGET_PER_HOUR", "300"))
+PREFETCH_IDLE_SECONDS = float(os.environ.get("PREFETCH_IDLE_SECONDS", "60"))
+UPCOMING_WINDOW = 7 * 86400  # bu kadar sonraki maçlar "yaklaşan" sayılır
+UPCOMING_BOOST = 4.0
+UPCOMING_EARLY = 0.5  # yaklaşan maçlarda aralığın yarısı dolunca yenile
+PREFETCH_MAX_UPCOMING = int(os.environ.get("PREFETCH_MAX_UPCOMING", "100"))  # en fazla izlenen yaklaşan maç
+PREFETCH_MAX_FIXTURES_PER_REQUEST = 50
+PREFETCH_MAX_NAME_LENGTH = 80
+
+# Yenileme aralıkları yanıt önbelleği TTL'leriyle aynı; işler önbelleği koşullu istekle yeniden
+# doğruladığı için (http_client.revalidate) aralık dolmadan yapılan erken yenileme de sunucuya gider.
+# Maliyet = tahmini HTTP istek sayısı
+PREFETCH_INTERVALS: Dict[str, float] = {
+    "team_info": 3 * 86400,
+    "fixtures": 6 * 3600,
+    "h2h": 86400,
+    "referee": REFEREE_STATS_TTL,
+}
+PREFETCH_COSTS: Dict[str, int] = {"team_info": 1, "fixtures": 2, "h2h": 1, "referee": 2}
+# İşler hatayı kendileri yakalayıp boş değer döndürür ({} / [] / None); boş sonuç başarısız sayılır.
+# İki takım hiç karşılaşmamış olabilir: h2h'ta boş liste geçerli bir sonuçtur
+PREFETCH_EMPTY_OK = {"h2h"}
+# Başarısız görev tüm aralık beklenmeden üstel geri çekilmeyle yeniden denenir (en fazla aralık kadar)
+PREFETCH_RETRY_BASE = float(os.environ.get("PREFETCH_RETRY_BASE", "900"))
+
+Task = Tuple[str, Tuple[str, ...]]
+
+
+class RequestBudget:
+    def __init__(self, per_hour: float) -> None:
+        self.rate = per_hour / 3600.0
+        self.capacity = max(per_hour / 12.0, 1.0)  # en fazla 5 dakikalık birikim
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait_time(self, cost: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return 0.0
+            return (cost - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+
+class PrefetchScheduler:
+    def __init__(self, jobs: Dict[str, Callable[..., Any]], budget_per_hour: float = PREFETCH_BUDGET_PER_HOUR,
+                 db_name: str = "prefetch.sqlite3") -> None:
+        self.jobs = jobs
+        self.budget = RequestBudget(budget_per_hour)
+        self._db_name = db_name
+        self._conn = None
+        self._lock = threading.Lock()
+        # normalize (a, b) -> (başlama zamanı, a, b); aynı takımın farklı yazımları tek görev olur
+        self._upcoming: Dict[Tuple[str, str], Tuple[float, str, str]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"runs": 0, "failures": 0}
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self._db_name)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS prefetch_state ("
+                " key TEXT PRIMARY KEY, last_run REAL, failures INTEGER DEFAULT 0)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _key(task: Task) -> str:
+        kind, args = task
+        return json.dumps([kind, [normalize_team_name(a) for a in args]], ensure_ascii=False)
+
+    def note_fixture(self, team_a: str, team_b: str, kickoff: Optional[float] = None) -> bool:
+        # Analiz/tahmin istekleri ve /prefetch/fixtures ile bildirilen maçlar. Geçersiz isimler ve
+        # liste doluyken gelen yeni maçlar kabul edilmez (False)
+        team_a, team_b = team_a.strip(), team_b.strip()
+        key = (normalize_team_name(team_a), normalize_team_name(team_b))
+        if not all(key) or key[0] == key[1] or max(len(team_a), len(team_b)) > PREFETCH_MAX_NAME_LENGTH:
+            return False
+        self.upcoming()
+        with self._lock:
+            if key not in self._upcoming and len(self._upcoming) >= PREFETCH_MAX_UPCOMING:
+                return False
+            _, team_a, team_b = self._upcoming.get(key, (None, team_a, team_b))  # ilk yazım korunur
+            self._upcoming[key] = (kickoff or time.time(), team_a, team_b)
+        return True
+
+    def upcoming(self) -> List[Tuple[str, str]]:
+        now = time.time()
+        with self._lock:
+            for key, (kickoff, _, _) in list(self._upcoming.items()):
+                if kickoff < now - 86400 or kickoff > now + UPCOMING_WINDOW:
+                    del self._upcoming[key]
+            return [(a, b) for _, a, b in self._upcoming.values()]
+
+    def _tasks(self) -> Dict[Task, bool]:
+        # Görev -> yaklaşan bir maçla ilgili mi. Takımlar normalize isimle tekilleştirilir;
+        # takimlar.json'daki yazım tercih edilir
+        upcoming = self.upcoming()
+        names = {normalize_team_name(n): n for n in load_team_names()}
+        for pair in upcoming:
+            for name in pair:
+                names.setdefault(normalize_team_name(name), name)
+        hot = {normalize_team_name(t) for pair in upcoming for t in pair}
+        tasks: Dict[Task, bool] = {}
+        for norm, name in names.items():
+            for kind in ("team_info", "fixtures"):
+                tasks[(kind, (name,))] = norm in hot
+        for name in load_referee_names():
+            tasks[("referee", (name,))] = False
+        for a, b in upcoming:
+            tasks[("h2h", (names[normalize_team_name(a)], names[normalize_team_name(b)]))] = True
+        return {t: v for t, v in tasks.items() if t[0] in self.jobs}
+
+    def due(self, limit: int = 50) -> List[Tuple[float, Task]]:
+        tasks = self._tasks()
+        with self._lock:
+            state = dict(self._db().execute("SELECT key, last_run FROM prefetch_state").fetchall())
+        now = time.time()
+        scored = []
+        for task, hot in tasks.items():
+            staleness = (now - state.get(self._key(task), 0.0)) / PREFETCH_INTERVALS[task[0]]
+            if staleness < (UPCOMING_EARLY if hot else 1.0):
+                continue
+            scored.append((staleness * (UPCOMING_BOOST if hot else 1.0), task))
+        return heapq.nlargest(limit, scored)
+
+    @staticmethod
+    def _succeeded(kind: str, result: Any, started: float) -> bool:
+        if not result:
+            return kind in PREFETCH_EMPTY_OK
+        # Hata olunca depodaki eski kaydı döndüren işler (fetch_referee_stats): kayıt yenilenmemiş
+        updated_at = getattr(result, "updated_at", None)
+        return updated_at is None or updated_at >= started
+
+    def run_task(self, task: Task) -> bool:
+        kind, args = task
+        started = time.time()
+        try:
+            # Önbellekteki taze kayıt yeterli değil: amaç kaynağı yenilemek
+            with revalidate():
+                result = self.jobs[kind](*args)
+            ok = self._succeeded(kind, result, started)
+            if not ok:
+                print(f"[WARN] prefetch {kind} {args}: boş/yenilenmemiş sonuç")
+        except Exception as e:
+            ok = False
+            print(f"[WARN] prefetch {kind} {args}: {e}")
+        key = self._key(task)
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT failures FROM prefetch_state WHERE key = ?", (key,)).fetchone()
+            failures = 0 if ok else (row[0] if row else 0) + 1
+            last_run = now
+            if not ok:
+                # last_run geriye çekilir: görev PREFETCH_RETRY_BASE * 2^(hata-1) sonra tekrar vadesi gelir
+                interval = PREFETCH_INTERVALS[kind]
+                last_run = now - interval + min(interval, PREFETCH_RETRY_BASE * 2 ** min(failures - 1, 16))
+            db.execute(
+                "INSERT INTO prefetch_state (key, last_run, failures) VALUES (?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET last_run = excluded.last_run, failures = excluded.failures",
+                (key, last_run, failures),
+            )
+            db.commit()
+        self.stats["runs"] += 1
+        if not ok:
+            self.stats["failures"] += 1
+        return ok
+
+    def run_once(self) -> int:
+        ran = 0
+        for _, task in self.due():
+            wait = self.budget.wait_time(PREFETCH_COSTS[task[0]])
+            while wait > 0:
+                if self._stop.wait(min(wait, PREFETCH_IDLE_SECONDS)):
+                    return ran
+                wait = self.budget.wait_time(PREFETCH_COSTS[task[0]])
+            if self._stop.is_set():
+                return ran
+            self.run_task(task)
+            ran += 1
+        return ran
+
+    def _loop(self) -> None:
+        print(f"[LOG] prefetch başladı (bütçe: {PREFETCH_BUDGET_PER_HOUR:.0f} istek/saat)")
+        while not self._stop.is_set():
+            try:
+                ran = self.run_once()
+            except Exception as e:
+                print(f"[ERROR] prefetch döngüsü: {e}")
+                ran = 0
+            if not ran:
+                self._stop.wait(PREFETCH_IDLE_SECONDS)
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "upcoming": [list(p) for p in self.upcoming()],
+            "due": len(self.due(limit=10_000)),
+            **self.stats,
+        }
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from storage import PUBLIC_DATA_DIR, connect
+from team_store import normalize_team_name
+
+# Hakem başına, sezon başına sayısal istatistikler.
+# Profil + sezon POST'u bir kez kazınır, sonuçlar tabloda tutulur; ortalamalar doğrudan sayılardan
+# hesaplanır, HTML sadece yanıt verilirken (render_referee_html) üretilir.
+
+REFEREE_STATS_TTL = float(os.environ.get("REFEREE_STATS_TTL", str(24 * 3600)))
+DEFAULT_SEASON = os.environ.get("REFEREE_SEASON", "2024")
+
+
+@dataclass
+class RefereeStats:
+    name: str
+    season: str
+    profile_url: Optional[str] = None
+    photo_url: Optional[str] = None
+    dob: str = "?"
+    birthplace: str = "?"
+    matches: int = 0
+    yellow: int = 0
+    second_yellow: int = 0
+    red: int = 0
+    penalties: int = 0
+    updated_at: float = field(default_factory=time.time)
+
+    def display(self) -> Dict[str, int]:
+        # Eski HTML'deki alan adları
+        return {
+            "Maç": self.matches,
+            "Sarı Kart": self.yellow,
+            "2. Sarıdan Kırmızı": self.second_yellow,
+            "Direkt Kırmızı": self.red,
+            "Penaltı": self.penalties,
+        }
+
+    def averages(self) -> Dict[str, str]:
+        # Yanıttaki avg_* alanlarının biçimi (maç yoksa "-")
+        if not self.matches:
+            return {"avg_yellow": "-", "avg_penalty": "-", "avg_red": "-"}
+        return {
+            "avg_yellow": str(round(self.yellow / self.matches, 2)),
+            "avg_penalty": str(round(self.penalties / self.matches, 2)),
+            "avg_red": str(round((self.second_yellow + self.red) / self.matches, 2)),
+        }
+
+
+def render_referee_html(stats: RefereeStats) -> str:
+    return (
+        f"<b>📋 Hakem:</b> {stats.name.title()}<br><b>🎂 Doğum Tarihi/Yaş:</b> {stats.dob}<br>"
+        f"<b>📍 Doğum Yeri:</b> {stats.birthplace}<br><b>📊 {stats.season} Sezonu İstatistikleri:</b><br>"
+        + "".join(f"{k}: {v}<br>" for k, v in stats.display().items())
+    )
+
+
+class RefereeStore:
+    def __init__(self, db_name: str = "referees.sqlite3", ttl: float = REFEREE_STATS_TTL) -> None:
+        self._db_name = db_name
+        self.ttl = ttl
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self._db_name)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS referee_stats ("
+                " key TEXT, season TEXT, name TEXT, profile_url TEXT, photo_url TEXT, dob TEXT, birthplace TEXT,"
+                " matches INTEGER, yellow INTEGER, second_yellow INTEGER, red INTEGER, penalties INTEGER,"
+                " updated_at REAL, PRIMARY KEY (key, season))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, name: str, season: str = DEFAULT_SEASON, allow_stale: bool = False) -> Optional[RefereeStats]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT name, season, profile_url, photo_url, dob, birthplace, matches, yellow, second_yellow,"
+                " red, penalties, updated_at FROM referee_stats WHERE key = ? AND season = ?",
+                (normalize_team_name(name), season),
+            ).fetchone()
+        if row is None:
+            return None
+        stats = RefereeStats(*row)
+        if not allow_stale and time.time() - stats.updated_at > self.ttl:
+            return None
+        return stats
+
+    def put(self, stats: RefereeStats) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO referee_stats (key, season, name, profile_url, photo_url, dob, birthplace,"
+                " matches, yellow, second_yellow, red, penalties, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (normalize_team_name(stats.name), stats.season, stats.name, stats.profile_url, stats.photo_url,
+                 stats.dob, stats.birthplace, stats.matches, stats.yellow, stats.second_yellow, stats.red,
+                 stats.penalties, stats.updated_at),
+            )
+            db.commit()
+
+
+referee_store = RefereeStore()
+
+
+def load_referee_names(path: Optional[str] = None) -> List[str]:
+    path = path or os.path.join(PUBLIC_DATA_DIR, "hakemler.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [n for n in json.load(f) if isinstance(n, str)]
+    except Exception as e:
+        print(f"[WARN] hakem listesi okunamadı: {path} {e}")
+        return []
+
+
+def prewarm_referee_store(fetch_fn: Callable[[str, str], Optional[RefereeStats]], season: str = DEFAULT_SEASON,
+                          path: Optional[str] = None) -> int:
+    # Sadece tabloda olmayan ya da süresi dolmuş hakemler kazınır; fetch_fn sonucu depoya yazar
+    fetched = 0
+    for name in load_referee_names(path):
+        if referee_store.get(name, season):
+            continue
+        try:
+            if fetch_fn(name, season):
+                fetched += 1
+        except Exception as e:
+            print(f"[WARN] prewarm hakem {name}: {e}")
+    print(f"[LOG] hakem deposu ısıtıldı: {fetched} hakem")
+    return fetched
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from storage import connect
+
+# Scraper isteklerinin altında çalışan kalıcı HTTP yanıt önbelleği.
+# Anahtar: method + URL + form gövdesi. Sayfa türüne göre TTL, süresi dolan
+# kayıtlar için koşullu istek (ETag / Last-Modified), bayt bütçesi aşılınca LRU tahliye.
+# Toplam boyut tek satırlık cache_meta tablosunda, yazma işleminin içinde tutulur: birden çok
+# işçi süreç aynı veritabanını kullansa da bütçe aşılmaz.
+
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "1") == "1"
+# LRU erişim zamanı en fazla bu sıklıkta yazılır: her okumada yazma + commit olmasın
+RESPONSE_CACHE_TOUCH_INTERVAL = float(os.environ.get("RESPONSE_CACHE_TOUCH_INTERVAL", "300"))
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# (URL deseni, TTL saniye) - ilk eşleşen kullanılır; eşleşmeyen URL önbelleğe alınmaz
+PAGE_TTLS: List[Tuple[re.Pattern, float]] = [
+    (re.compile(r"/schnellsuche/"), 7 * DAY),              # quick search
+    (re.compile(r"/spielplandatum/"), 6 * HOUR),           # fikstür / son maçlar
+    (re.compile(r"/vergleich/bilanzdetail/"), DAY),        # h2h
+    (re.compile(r"/startseite/verein/"), 3 * DAY),         # takım sayfası / kadro bilgisi
+    (re.compile(r"/profil/schiedsrichter/"), DAY),         # hakem sayfası ve sezon POST'u
+    (re.compile(r"\.(png|jpe?g|gif|webp|svg)(\?|$)", re.I), 30 * DAY),  # logo / fotoğraf
+]
+
+
+def ttl_for_url(url: str) -> Optional[float]:
+    for pattern, ttl in PAGE_TTLS:
+        if pattern.search(url):
+            return ttl
+    return None
+
+
+def cache_key(method: str, url: str, data: Optional[Dict[str, Any]] = None) -> str:
+    body = urlencode(sorted(data.items())) if data else ""
+    return hashlib.sha256(f"{method.upper()} {url}\n{body}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    encoding: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        out = {}
+        if self.headers.get("ETag"):
+            out["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            out["If-Modified-Since"] = self.headers["Last-Modified"]
+        return out
+
+    def to_response(self) -> requests.Response:
+        r = requests.Response()
+        r.status_code = self.status_code
+        r._content = self.content
+        r.headers = CaseInsensitiveDict(self.headers)
+        r.encoding = self.encoding
+        r.url = self.url
+        return r
+
+
+class ResponseCache:
+    KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+    def __init__(self, db_name: str = "http_cache.sqlite3", max_bytes: int = RESPONSE_CACHE_MAX_BYTES) -> None:
+        self._db_name = db_name
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self._db_name)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT, encoding TEXT,"
+                " body BLOB, size INTEGER, expires_at REAL, last_access REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_meta (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER)"
+            )
+            # Eski veritabanları: toplam bir kez hesaplanır
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cache_meta (id, total) SELECT 0, COALESCE(SUM(size), 0) FROM responses"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db().execute("SELECT total FROM cache_meta WHERE id = 0").fetchone()[0]
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT url, status, headers, encoding, body, expires_at, last_access FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - (row[6] or 0) > RESPONSE_CACHE_TOUCH_INTERVAL:
+                db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                db.commit()
+        return CachedResponse(row[0], row[1], json.loads(row[2]), row[4], row[3], row[5])
+
+    def put(self, key: str, resp: requests.Response, ttl: float) -> None:
+        headers = {h: resp.headers[h] for h in self.KEPT_HEADERS if h in resp.headers}
+        body = resp.content
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            # Yazma kilidi baştan alınır: eski boyut okuma, ekleme, toplam ve tahliye tek işlemde
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                old = db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+                db.execute(
+                    "INSERT OR REPLACE INTO responses"
+                    " (key, url, status, headers, encoding, body, size, expires_at, last_access)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, resp.url, resp.status_code, json.dumps(headers), resp.encoding, body, len(body),
+                     now + ttl, now),
+                )
+                db.execute("UPDATE cache_meta SET total = total + ? WHERE id = 0",
+                           (len(body) - (old[0] if old else 0),))
+                self._evict(db)
+                db.commit()
+            except BaseException:
+                db.rollback()
+                raise
+
+    def refresh(self, key: str, ttl: float) -> None:
+        # 304 Not Modified: gövde aynı, sadece süre uzatılır
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?", (now + ttl, now, key))
+            db.commit()
+
+    def _evict(self, db) -> None:
+        # put'un yazma işlemi içinde çağrılır
+        total = db.execute("SELECT total FROM cache_meta WHERE id = 0").fetchone()[0]
+        freed = 0
+        while total - freed > self.max_bytes:
+            rows = db.execute("SELECT key, size FROM responses ORDER BY last_access LIMIT 32").fetchall()
+            if not rows:
+                freed = total
+                break
+            for key, size in rows:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                freed += size
+                if total - freed <= self.max_bytes:
+                    break
+        if freed:
+            db.execute("UPDATE cache_meta SET total = ? WHERE id = 0", (total - freed,))
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM responses")
+            db.execute("UPDATE cache_meta SET total = 0 WHERE id = 0")
+            db.commit()
+
+
+response_cache = ResponseCache()
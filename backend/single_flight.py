@@ -0,0 +1,31 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Sequence
+
+from team_store import normalize_team_name
+
+# Aynı anahtarla eşzamanlı gelen çağrılar tek bir hesaplamaya bağlanır;
+# ilk gelen çalıştırır, diğerleri onun sonucunu (veya hatasını) paylaşır.
+# Aynı event loop'taki coroutine'ler içindir (analiz işleri JobManager'da ayrıca birleştirilir).
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        # Hesaplama ayrı bir task'ta koşar; bir istemcinin kopması diğerlerini iptal etmez
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._tasks[key] = task
+
+            def done(t: "asyncio.Future[Any]") -> None:
+                if self._tasks.get(key) is t:
+                    del self._tasks[key]
+            task.add_done_callback(done)
+        return await asyncio.shield(task)
+
+
+def fixture_key(team_a: str, team_b: str, referees: Sequence[Optional[str]] = (), *extra: Hashable) -> Hashable:
+    refs = tuple(normalize_team_name(r) if r else "" for r in referees)
+    return (normalize_team_name(team_a), normalize_team_name(team_b), refs) + tuple(extra)
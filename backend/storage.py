@@ -0,0 +1,23 @@
+import os
+import sqlite3
+
+# Kalıcı önbellek ve veri dosyalarının yerleri (yeniden başlatmalarda korunur)
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("FOOTBALL_CACHE_DIR", os.path.join(BACKEND_DIR, "cache"))
+# takimlar.json / hakemler.json
+PUBLIC_DATA_DIR = os.environ.get(
+    "PUBLIC_DATA_DIR", os.path.join(os.path.dirname(BACKEND_DIR), "frontend", "public")
+)
+
+
+def cache_path(*parts: str) -> str:
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def connect(db_name: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(cache_path(db_name), check_same_thread=False, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
@@ -0,0 +1,148 @@
+import os
+from typing import Any, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+# Oyuncu kutularından forma rengi (HSV ortalaması) çıkarımı ve takım sınıflandırması, toplu (batch) hâlde.
+# Karenin HSV'si varsa tüm kutular aynı diziden okunur, yoksa sadece kutular dönüştürülür;
+# sınıflandırma tüm oyuncular için tek bir NumPy uzaklık hesabıdır.
+
+
+def boxes_to_array(boxes: Any) -> np.ndarray:
+    # ultralytics Boxes (xyxy tensörü), .xyxy taşıyan kutu listesi ya da (N,4) dizi kabul edilir
+    if boxes is None:
+        return np.zeros((0, 4), dtype=np.float32)
+    xyxy = getattr(boxes, "xyxy", None)
+    if xyxy is not None:
+        if hasattr(xyxy, "cpu"):
+            xyxy = xyxy.cpu().numpy()
+        return np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+    if isinstance(boxes, (list, tuple)) and boxes and hasattr(boxes[0], "xyxy"):
+        return np.concatenate([boxes_to_array(b) for b in boxes])
+    return np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+
+def batch_hsv_means(frame: np.ndarray, boxes: Any, hsv: Optional[np.ndarray] = None) -> np.ndarray:
+    # get_hsv_mean ile aynı sonuç (boş kutu -> [0, 0, 0]). Karenin HSV'si zaten hesaplandıysa
+    # (pipeline'da dedektörün saha maskesi) kutular bu dizinin görünümlerinden okunur. Verilmezse sadece
+    # kutular kırpılıp dönüştürülür: tam kare dönüşümü az kutuda kırpmalardan pahalıdır
+    xyxy = boxes_to_array(boxes)
+    if len(xyxy) == 0:
+        return np.zeros((0, 3))
+    h, w = frame.shape[:2]
+    means = np.zeros((len(xyxy), 3))
+    # Kutu sayısı az (~20): sınırlar NumPy dizi işlemleri yerine Python'da kırpılır (sabit ek yük düşük)
+    for i, (x1, y1, x2, y2) in enumerate(xyxy.astype(np.int64).tolist()):  # int() gibi sıfıra doğru kırpar
+        x1, x2 = min(max(x1, 0), w), min(max(x2, 0), w)
+        y1, y2 = min(max(y1, 0), h), min(max(y2, 0), h)
+        if x2 <= x1 or y2 <= y1:
+            continue
+        crop = hsv[y1:y2, x1:x2] if hsv is not None else cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2HSV)
+        means[i] = cv2.mean(crop)[:3]
+    return means
+
+
+def classify_hsv(hsv_values: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    # (N,3) x (K,3) -> her oyuncu için en yakın merkezin indeksi
+    hsv_values = np.asarray(hsv_values, dtype=np.float64).reshape(-1, 3)
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+    d = ((hsv_values[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+    return d.argmin(axis=1)
+
+
+def classify_players(hsv_values: np.ndarray, team_a_color: Optional[np.ndarray], team_b_color: Optional[np.ndarray],
+                     team_a_name: str, team_b_name: str) -> List[str]:
+    # classify_player'ın toplu hâli; eşitlikte (da == db) o da B takımını seçer
+    hsv_values = np.asarray(hsv_values, dtype=np.float64).reshape(-1, 3)
+    if team_a_color is None or team_b_color is None:
+        return ["Unknown"] * len(hsv_values)
+    da = ((hsv_values - team_a_color) ** 2).sum(axis=1)
+    db = ((hsv_values - team_b_color) ** 2).sum(axis=1)
+    return [team_a_name if a else team_b_name for a in (da < db)]
+
+
+def order_team_colors(colors: Sequence[np.ndarray]):
+    # initialize_team_colors sırası: doygunluğu (S) düşük olan önce
+    return (colors[0], colors[1]) if colors[0][1] < colors[1][1] else (colors[1], colors[0])
+
+
+# --- Artımlı takım rengi modeli ---
+# Her karede KMeans yeniden fit edilmez: iki merkez (formalardan ya da ilk örneklerden) tutulur ve
+# mini-batch k-means adımıyla güncellenir. Sınıflandırma O(N) en yakın merkez araması + güven skorudur.
+TEAM_COLOR_MAX_COUNT = float(os.environ.get("TEAM_COLOR_MAX_COUNT", "500"))  # öğrenme hızı alt sınırı: 1/max_count
+TEAM_COLOR_SEED_WEIGHT = float(os.environ.get("TEAM_COLOR_SEED_WEIGHT", "50"))  # forma tohumunun örnek ağırlığı
+TEAM_COLOR_UPDATE_MIN_CONF = float(os.environ.get("TEAM_COLOR_UPDATE_MIN_CONF", "0.15"))
+
+
+def _two_means(x: np.ndarray, iterations: int = 8) -> np.ndarray:
+    # Deterministik başlangıç: ortalamadan en uzak nokta ve ona en uzak nokta; birkaç Lloyd adımı
+    a = x[((x - x.mean(axis=0)) ** 2).sum(axis=1).argmax()]
+    b = x[((x - a) ** 2).sum(axis=1).argmax()]
+    centers = np.stack([a, b]).astype(np.float64)
+    for _ in range(iterations):
+        labels = classify_hsv(x, centers)
+        for k in range(2):
+            if (labels == k).any():
+                centers[k] = x[labels == k].mean(axis=0)
+    return centers
+
+
+class TeamColorModel:
+    def __init__(self, team_a_color: Optional[np.ndarray] = None, team_b_color: Optional[np.ndarray] = None,
+                 max_count: float = TEAM_COLOR_MAX_COUNT) -> None:
+        self.max_count = max_count
+        self.centers: Optional[np.ndarray] = None
+        self.counts = np.zeros(2)
+        self.updates = 0
+        if team_a_color is not None and team_b_color is not None:
+            self.centers = np.stack([np.asarray(team_a_color, np.float64), np.asarray(team_b_color, np.float64)])
+            self.counts[:] = TEAM_COLOR_SEED_WEIGHT
+
+    @property
+    def ready(self) -> bool:
+        return self.centers is not None
+
+    def colors(self):
+        if self.centers is None:
+            return None, None
+        return self.centers[0].copy(), self.centers[1].copy()
+
+    def predict(self, hsv_values: np.ndarray):
+        # (etiket, güven): 0 = A, 1 = B; güven = (d_diğer - d_kendi) / (d_diğer + d_kendi) ∈ [0, 1]
+        x = np.asarray(hsv_values, dtype=np.float64).reshape(-1, 3)
+        if self.centers is None or len(x) == 0:
+            return np.full(len(x), -1), np.zeros(len(x))
+        d = np.sqrt(((x[:, None, :] - self.centers[None, :, :]) ** 2).sum(axis=2))
+        labels = np.where(d[:, 0] < d[:, 1], 0, 1)  # eşitlikte B (classify_player ile aynı)
+        near = d[np.arange(len(x)), labels]
+        far = d[np.arange(len(x)), 1 - labels]
+        return labels, (far - near) / (far + near + 1e-9)
+
+    def partial_fit(self, hsv_values: np.ndarray) -> "TeamColorModel":
+        x = np.asarray(hsv_values, dtype=np.float64).reshape(-1, 3)
+        x = x[x.any(axis=1)]  # boş kutular ([0, 0, 0]) atlanır
+        if self.centers is None:
+            if len(x) < 2:
+                return self
+            self.centers = np.stack(order_team_colors(_two_means(x)))
+            self.counts = np.bincount(classify_hsv(x, self.centers), minlength=2).astype(np.float64)
+            self.updates += 1
+            return self
+        labels, conf = self.predict(x)
+        # Hakem/kaleci gibi iki merkeze de uzak örnekler modeli kaydırmasın
+        keep = conf >= TEAM_COLOR_UPDATE_MIN_CONF
+        for k in range(2):
+            batch = x[keep & (labels == k)]
+            if not len(batch):
+                continue
+            n = min(self.counts[k], self.max_count)
+            self.centers[k] = (n * self.centers[k] + batch.sum(axis=0)) / (n + len(batch))
+            self.counts[k] = n + len(batch)
+        self.updates += 1
+        return self
+
+    def classify(self, hsv_values: np.ndarray, team_a_name: str, team_b_name: str):
+        labels, conf = self.predict(hsv_values)
+        names = [team_a_name if lb == 0 else team_b_name if lb == 1 else "Unknown" for lb in labels.tolist()]
+        return names, conf
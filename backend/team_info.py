@@ -1,26 +1,48 @@
 import requests
-from bs4 import BeautifulSoup
 from bs4.element import Tag
 import re
-from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple, Coroutine
-import base64
 import asyncio
 from functools import lru_cache
-import time
+
+from http_client import safe_get, safe_post
+from team_store import TEAM_GUESS_TTL, team_store, parse_team_url
+from referee_store import DEFAULT_SEASON, RefereeStats, referee_store, render_referee_html
+from html_parsing import (
+    parse_html,
+    parse_referee_profile,
+    parse_referee_season_stats,
+    get_match_result_emoji,
+    parse_fixture_rows,
+    parse_h2h_rows,
+    parse_team_header,
+    team_name_Temizle,
+    temizle_takim_adi,
+)
 
 # --- Takım URL ve ID çekme fonksiyonları ---
 def search_team_url(team_name: str) -> Optional[str]:
+    cached = team_store.lookup_url(team_name)
+    if cached:
+        return cached
+    url, confident = _search_team_url(team_name)
+    # Kesin eşleşme kalıcı saklanır; ilk sonuç tahmini kısa süre sonra yeniden aranır
+    team_store.remember_url(team_name, url, ttl=None if confident else TEAM_GUESS_TTL)
+    return url
+
+
+def _search_team_url(team_name: str) -> Tuple[Optional[str], bool]:
+    # (url, kesin eşleşme mi)
     query = team_name.replace(" ", "+")
     search_url = f"https://www.transfermarkt.com.tr/schnellsuche/ergebnis/schnellsuche?query={query}"
     headers = {"User-Agent": "Mozilla/5.0"}
     try:
         resp = safe_get(search_url, headers=headers, timeout=30)
         if resp is None:
-            return None
+            return None, False
         if resp.status_code != 200:
-            return None
-        soup = BeautifulSoup(resp.text, "html.parser")
+            return None, False
+        soup = parse_html(resp.text)
         results = [a for a in soup.select("a[href*='/startseite/verein/']") if isinstance(a, Tag)]
         for a in results:
             img = a.find("img")
@@ -34,21 +56,21 @@ def search_team_url(team_name: str) -> Optional[str]:
                 if team_name.lower() in alt_str.strip().lower():
                     href = a.get("href")
                     if isinstance(href, str):
-                        return f"https://www.transfermarkt.com.tr{href}"
+                        return f"https://www.transfermarkt.com.tr{href}", True
             text = a.get_text(strip=True)
             if text.lower() == team_name.lower():
                 href = a.get("href")
                 if isinstance(href, str):
-                    return f"https://www.transfermarkt.com.tr{href}"
+                    return f"https://www.transfermarkt.com.tr{href}", True
         if results:
             href = results[0].get("href")
             if isinstance(href, str):
-                return f"https://www.transfermarkt.com.tr{href}"
+                return f"https://www.transfermarkt.com.tr{href}", False
     except requests.exceptions.Timeout:
-        return None
+        return None, False
     except Exception as e:
         pass
-    return None
+    return None, False
 
 
 def get_team_id_from_url(team_url: Optional[str]) -> Optional[str]:
@@ -65,25 +87,6 @@ def find_team_id(team_name: str) -> Optional[str]:
     return result
 
 
-def temizle_takim_adi(adi: str) -> str:
-    result = re.sub(r"\(.*?\)", "", adi).strip().lower()
-    return result
-
-
-def get_match_result_emoji(team_score: int, opponent_score: int) -> str:
-    if team_score > opponent_score:
-        return "✅"
-    if team_score == opponent_score:
-        return "🤝"
-    return "❌"
-
-
-def team_name_Temizle(team_name: str) -> str:
-    name = team_name.lower().strip()
-    name = re.sub(r'\bfc\b', '', name)
-    result = name.strip()
-    return result
-
 # --- Takımın son 5 maçını getir ---
 def get_team_last_5_matches_with_tactics(team_name: str) -> Tuple[List[Dict[str, Any]], int, int, int, int , int]:
     def fetch_matches(url: str) -> List[Dict[str, Any]]:
@@ -93,44 +96,7 @@ def get_team_last_5_matches_with_tactics(team_name: str) -> Tuple[List[Dict[str,
                 return []
             if r.status_code != 200:
                 return []
-            s = BeautifulSoup(r.text, "html.parser")
-            div = s.find("div", class_="responsive-table")
-            if not isinstance(div, Tag):
-                return []
-            body = div.find("tbody")
-            if not isinstance(body, Tag):
-                return []
-            out = []
-            toplam_gol = 0
-            for row in body.find_all("tr") if isinstance(body, Tag) else []:
-                cols = row.find_all("td") if isinstance(row, Tag) else []
-                if len(cols) < 10:
-                    continue
-                t = cols[1].get_text(strip=True)
-                sc = cols[-1].get_text(strip=True)
-                parts = sc.split(":")
-                opp = cols[6].get_text(strip=True)
-                em = ""
-                try:
-                    if temizle_takim_adi(opp) == team_name_Temizle(team_name):
-                        opp = cols[4].get_text(strip=True)
-                        if len(parts) == 2:
-                            og, tg = map(int, parts)
-                            toplam_gol += tg + og
-                            em = get_match_result_emoji(tg, og)
-                    else:
-                        if len(parts) == 2:
-                            tg, og = map(int, parts)
-                            toplam_gol += tg + og
-                            em = get_match_result_emoji(tg, og)
-                except Exception:
-                    continue 
-                df = cols[-4].get_text(strip=True) or "Yok"
-                if re.match(r"\d+:\d+", sc):
-                    out.append({"tarih": t, "rakip": opp, "sonuc": sc, "dizilis": df, "emoji": em})
-                if len(out)>=500:
-                    break
-            return out
+            return parse_fixture_rows(r.text, team_name)
         except Exception as e:
             return []
 
@@ -141,7 +107,8 @@ def get_team_last_5_matches_with_tactics(team_name: str) -> Tuple[List[Dict[str,
         tid = get_team_id_from_url(u)
     if not tid:
         return [],0,0,0,0,0
-    slug = team_name.lower().replace(" ", "-")
+    parsed = parse_team_url(u)
+    slug = parsed[1] if parsed else team_name.lower().replace(" ", "-")
     url1 = f"https://www.transfermarkt.com.tr/{slug}/spielplandatum/verein/{tid}/plus/1"
     m = fetch_matches(url1)
     if len(m)<5:
@@ -171,15 +138,6 @@ def get_team_last_5_matches_with_tactics(team_name: str) -> Tuple[List[Dict[str,
             continue
     return last5, w, d, l, wh, kg
 
-def analyze_referee_stats(ref_stats: dict) -> None:
-    sari_kart = ref_stats.get('Sarı Kart', 0) / ref_stats.get('Maç', 1)
-    kirmizi_kart = (ref_stats.get('2. Sarıdan Kırmızı', 0) + ref_stats.get('Direkt Kırmızı', 0)) / ref_stats.get('Maç', 1)
-    penalti = ref_stats.get('Penaltı', 0) / ref_stats.get('Maç', 1)
-
-    print(f"🟡 Hakemin  Maç başı Sarı Kart Sayısı: {sari_kart:.2f}")
-    print(f"🟥 Hakemin Maç başı Kırmızı Kart Ortalaması: {kirmizi_kart:.2f}")
-    print(f"🟡 Hakemin  Maç başı Penaltı Sayısı: {penalti:.2f}")
-
 def analyze_team_performance(team_name: str, matches: list[dict], w: int, d: int, l: int, handikap: int, karsilikli: int) -> None:
     total_goals = 0
     ust_olan_mac = 0
@@ -207,37 +165,7 @@ def get_last_matches(team_a: str, team_b: str) -> List[Dict[str, Any]]:
             return []
         if r.status_code!=200:
             return []
-        s = BeautifulSoup(r.text, "html.parser")
-        table = s.find("table", class_="items")
-        if not isinstance(table, Tag):
-            return []
-        tbody = table.find("tbody")
-        if not isinstance(tbody, Tag):
-            return []
-        matches: List[Dict[str, Any]] = []
-        for row in tbody.find_all("tr"):
-            cols = row.find_all("td")
-            if len(cols) < 10:
-                continue
-            try:
-                date_text = cols[6].get_text(strip=True)
-                match_date = datetime.strptime(date_text, "%d.%m.%Y")
-                home_tag = cols[10].find('a')
-                home = home_tag['title'] if isinstance(home_tag, Tag) and home_tag.has_attr('title') else cols[10].get_text(strip=True)
-                guest_tag = cols[8].find('a')
-                guest = guest_tag['title'] if isinstance(guest_tag, Tag) and guest_tag.has_attr('title') else cols[8].get_text(strip=True)
-                result = cols[9].get_text(strip=True)
-                if result.startswith("-"):
-                    continue
-                matches.append({
-                    "date": match_date.strftime("%d.%m.%Y"),
-                    "home_team": home,
-                    "guest_team": guest,
-                    "result": result
-                })
-            except (ValueError, IndexError) as e:
-                continue
-        return matches[:5]
+        return parse_h2h_rows(r.text)[:5]
     except Exception as e:
         return []
 
@@ -249,7 +177,7 @@ def search_referee(name: str) -> Optional[str]:
     try:
         r = safe_get(u, headers={"User-Agent":"Mozilla/5.0"}, timeout=30)
         if r is None or r.status_code!=200: return None
-        s=BeautifulSoup(r.text,"html.parser")
+        s=parse_html(r.text)
         l=s.find("a",href=re.compile(r"/profil/schiedsrichter/"))
         if isinstance(l,Tag):
             href=l.get("href")
@@ -258,60 +186,48 @@ def search_referee(name: str) -> Optional[str]:
         print(f"search_referee error:{e}")
     return None
 
-# Hakem bilgisi
+# Hakem bilgisi (sayısal istatistikler referee_store'da tutulur, HTML sadece burada üretilir)
 
-def get_referee_info(name: str, season:str="2024") -> Tuple[str,Optional[str]]:
-    u=search_referee(name)
-    if not u: return "<b>❌ Hakem bulunamadı.</b>",None
-    if not u.endswith("/"): u+="/"
-    u+=f"saison/{season}"
+def fetch_referee_stats(name: str, season: str = DEFAULT_SEASON) -> Optional[RefereeStats]:
+    stale = referee_store.get(name, season, allow_stale=True)
+    u = stale.profile_url if stale and stale.profile_url else search_referee(name)
+    if not u: return None
+    base = u.split("saison/")[0]
+    if not base.endswith("/"): base += "/"
     try:
-        r = safe_get(u, headers={"User-Agent":"Mozilla/5.0"}, timeout=30)
-        if r is None or r.status_code!=200: return f"<b>❌ Hata:{r.status_code if r else 'timeout'}</b>",None
-        s=BeautifulSoup(r.text,"html.parser")
-        img_tag = s.find("img", class_="data-header__profile-image")
-        img_url: Optional[str] = None
-        if isinstance(img_tag, Tag) and img_tag.has_attr("src"):
-            src_attr = img_tag.get("src")
-            if isinstance(src_attr, str):
-                img_url = src_attr
-            elif isinstance(src_attr, list) and src_attr:
-                img_url = src_attr[0]
-        spans=s.select("div.info-table--equal-space > span.info-table__content--bold")
-        dob=spans[0].get_text(strip=True) if spans else "?"
-        birthplace=next((sp.get_text(strip=True) for sp in spans if isinstance(sp,Tag) and "Türkiye" in sp.get_text()),"?")
-        stats={"Maç":0,"Sarı Kart":0,"2. Sarıdan Kırmızı":0,"Direkt Kırmızı":0,"Penaltı":0}
-        form=s.find("form",action=re.compile(r"/profil/schiedsrichter"))
-        if isinstance(form,Tag):
-            action=form.get("action")
-            if isinstance(action,str):
-                full=f"https://www.transfermarkt.com.tr{action}"
-                sel=form.select_one("select[name='saison_id']")
-                if isinstance(sel,Tag):
-                    opt=next((o for o in sel.find_all("option") if season in o.get_text()),None)
-                    if isinstance(opt,Tag) and opt.get("value"): 
-                        data={"funktion":"1","saison_id":opt.get("value")} 
-                        rr=requests.post(full,headers={"User-Agent":"Mozilla/5.0"},data=data)
-                        ss=BeautifulSoup(rr.text,"html.parser")
-                        tb2=ss.find("table",class_="items")
-                        if isinstance(tb2,Tag):
-                            tbod=tb2.find("tbody")
-                            if isinstance(tbod,Tag):
-                                for rw in tbod.find_all("tr"):
-                                    cd=rw.find_all("td")
-                                    if len(cd)>=7:
-                                        try:
-                                            stats["Maç"]+=int(cd[2].get_text(strip=True))
-                                            stats["Sarı Kart"]+=int(cd[3].get_text(strip=True))
-                                            stats["2. Sarıdan Kırmızı"]+=int(cd[4].get_text(strip=True))
-                                            stats["Direkt Kırmızı"]+=int(cd[5].get_text(strip=True))
-                                            stats["Penaltı"]+=int(cd[6].get_text(strip=True))
-                                        except: pass
-        html=f"<b>📋 Hakem:</b> {name.title()}<br><b>🎂 Doğum Tarihi/Yaş:</b> {dob}<br><b>📍 Doğum Yeri:</b> {birthplace}<br><b>📊 {season} Sezonu İstatistikleri:</b><br>"+"".join([f"{k}: {v}<br>" for k,v in stats.items()])
-        return html,img_url
+        r = safe_get(f"{base}saison/{season}", headers={"User-Agent":"Mozilla/5.0"}, timeout=30)
+        if r is None or r.status_code!=200: return stale
+        profile = parse_referee_profile(r.text)
+        stats = RefereeStats(name=name, season=season, profile_url=base, photo_url=profile["photo_url"],
+                             dob=profile["dob"], birthplace=profile["birthplace"])
+        value = next((v for text, v in profile["seasons"].items() if season in text), None)
+        if not profile["form_action"] or not value:
+            print(f"[WARN] fetch_referee_stats: {name} için {season} sezonu bulunamadı")
+            return stale
+        data = {"funktion":"1","saison_id":value}
+        rr = safe_post(f"https://www.transfermarkt.com.tr{profile['form_action']}", data=data, headers={"User-Agent":"Mozilla/5.0"}, timeout=30)
+        season_stats = parse_referee_season_stats(rr.text) if rr is not None and rr.status_code==200 else None
+        if season_stats is None:
+            # Sezon istatistikleri alınamadı: sıfırlar TTL boyunca saklanmasın, varsa eski kayıt kalır
+            print(f"[WARN] fetch_referee_stats: {name} sezon istatistikleri alınamadı")
+            return stale
+        for k, v in season_stats.items():
+            setattr(stats, k, v)
+        referee_store.put(stats)
+        return stats
     except Exception as e:
-        print(f"get_referee_info error:{e}")
-        return f"<b>❌ Hata:{e}</b>",None
+        print(f"fetch_referee_stats error:{e}")
+        return stale
+
+
+def get_referee_stats(name: str, season: str = DEFAULT_SEASON) -> Optional[RefereeStats]:
+    return referee_store.get(name, season) or fetch_referee_stats(name, season)
+
+
+def get_referee_info(name: str, season:str=DEFAULT_SEASON) -> Tuple[str,Optional[str]]:
+    stats = get_referee_stats(name, season)
+    if stats is None: return "<b>❌ Hakem bulunamadı.</b>",None
+    return render_referee_html(stats), stats.photo_url
 
 # Takım bilgisi
 def get_team_info(name: str) -> Dict[str, Any]:
@@ -320,51 +236,10 @@ def get_team_info(name: str) -> Dict[str, Any]:
         if not url:
             return {}
         headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, headers=headers, timeout=30)
-        if resp.status_code != 200:
+        resp = safe_get(url, headers=headers, timeout=30)
+        if resp is None or resp.status_code != 200:
             return {}
-        soup = BeautifulSoup(resp.text, "html.parser")
-        tn = soup.find("h1", class_="data-header__headline-wrapper")
-        team_name = tn.get_text(strip=True) if isinstance(tn, Tag) else "?"
-        lg = soup.find("span", class_="data-header__club")
-        league_name = lg.get_text(strip=True) if isinstance(lg, Tag) else "?"
-        league_rank = "?"
-        for label in soup.find_all("span", class_="data-header__label"):
-            if "Lig Sıralaması" in label.get_text():
-                cont = label.find_next_sibling("span", class_="data-header__content")
-                if isinstance(cont, Tag):
-                    a = cont.find("a")
-                    league_rank = a.get_text(strip=True) if isinstance(a, Tag) else cont.get_text(strip=True)
-                break
-        logo_div = soup.find("div", class_="data-header__profile-container")
-        logo_img = logo_div.find("img") if isinstance(logo_div, Tag) else None
-        logo_url = logo_img["src"] if isinstance(logo_img, Tag) and logo_img.has_attr("src") else None
-        cups: list[str] = []
-        for cup in soup.find_all("a", class_="data-header__success-data") if isinstance(soup, Tag) else []:
-            title = cup.get("title", "Kupa") if isinstance(cup, Tag) else "Kupa"
-            num = cup.find("span", class_="data-header__success-number") if isinstance(cup, Tag) else None
-            cups.append(f"{title}: {num.get_text(strip=True) if isinstance(num, Tag) else '?'}")
-        market = soup.find("a", class_="data-header__market-value-wrapper")
-        squad_value = market.get_text(strip=True) if isinstance(market, Tag) else "?"
-        def find_data(label_text: str) -> str:
-            for li in soup.select("ul.data-header__items li") if isinstance(soup, Tag) else []:
-                if label_text in li.get_text():
-                    cont = li.find("span", class_="data-header__content") if isinstance(li, Tag) else None
-                    return cont.get_text(strip=True) if isinstance(cont, Tag) else "?"
-            return "?"
-        age_avg = find_data("Yaş ortalaması")
-        stadium = find_data("Stadyum")
-        result = {
-            "Takım": team_name,
-            "Lig": league_name,
-            "Lig Sıralaması": league_rank,
-            "Logo URL": logo_url,
-            "Kupalar": cups,
-            "Kadro Değeri": squad_value,
-            "Yaş Ortalaması": age_avg,
-            "Stadyum": stadium
-        }
-        return result
+        return parse_team_header(resp.text)
     except requests.exceptions.Timeout:
         return {}
     except Exception as e:
@@ -372,16 +247,6 @@ def get_team_info(name: str) -> Dict[str, Any]:
         return {}
 
 
-def get_image_as_base64(url: str) -> Optional[str]:
-    if not url: return None
-    try:
-        r = safe_get(url, headers={"User-Agent":"Mozilla/5.0"}, timeout=30)
-        if r is not None and r.status_code==200:
-            return base64.b64encode(r.content).decode()
-    except Exception as e:
-        print(f"get_image_as_base64 error:{e}")
-    return None
-
 # --- Takım URL ve ID çekme fonksiyonları ---
 @lru_cache(maxsize=128)
 def search_team_url_cached(team_name: str) -> Optional[str]:
@@ -429,29 +294,9 @@ async def async_get_team_info(name: str):
     return await loop.run_in_executor(None, get_team_info_cached, name)
 
 @lru_cache(maxsize=128)
-def get_referee_info_cached(name: str, season: str = "2024"):
+def get_referee_info_cached(name: str, season: str = DEFAULT_SEASON):
     return get_referee_info(name, season)
 
-async def async_get_referee_info(name: str, season: str = "2024"):
+async def async_get_referee_info(name: str, season: str = DEFAULT_SEASON):
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(None, get_referee_info_cached, name, season)
-
-@lru_cache(maxsize=128)
-def get_image_as_base64_cached(url: str):
-    return get_image_as_base64(url)
-
-async def async_get_image_as_base64(url: str):
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_image_as_base64_cached, url)
-
-def safe_get(url, headers=None, timeout=30, retries=3, wait=2):
-    for attempt in range(retries):
-        try:
-            return requests.get(url, headers=headers, timeout=timeout)
-        except requests.exceptions.Timeout:
-            print(f"[WARN] Timeout, retrying {attempt+1}/{retries}... {url}")
-            time.sleep(wait)
-        except Exception as e:
-            print(f"[ERROR] safe_get error: {e} {url}")
-            break
-    return None
@@ -0,0 +1,116 @@
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Callable, List, Optional, Tuple
+
+from storage import PUBLIC_DATA_DIR, connect
+
+# Takım adı -> Transfermarkt verein ID + gerçek URL slug'ı.
+# Aynı takım için quick search tekrar tekrar yapılmasın diye diskte tutulur.
+
+TM_BASE = "https://www.transfermarkt.com.tr"
+TEAM_URL_RE = re.compile(r"/([^/]+)/startseite/verein/(\d+)")
+# Arama sonucunda isim eşleşmeyip ilk sonuç tahmin edildiyse kayıt bu süre sonra yeniden aranır
+TEAM_GUESS_TTL = float(os.environ.get("TEAM_GUESS_TTL", str(86400)))
+
+
+def normalize_team_name(name: str) -> str:
+    name = unicodedata.normalize("NFKD", name.casefold())
+    name = "".join(ch for ch in name if not unicodedata.combining(ch))
+    name = name.replace("ı", "i")
+    name = re.sub(r"[^\w&]+", " ", name)
+    return " ".join(name.split())
+
+
+def parse_team_url(team_url: Optional[str]) -> Optional[Tuple[str, str]]:
+    if not team_url:
+        return None
+    m = TEAM_URL_RE.search(team_url)
+    if not m:
+        return None
+    return m.group(2), m.group(1)
+
+
+def team_page_url(team_id: str, slug: str) -> str:
+    return f"{TM_BASE}/{slug}/startseite/verein/{team_id}"
+
+
+class TeamStore:
+    def __init__(self, db_name: str = "teams.sqlite3") -> None:
+        self._db_name = db_name
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self._db_name)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS teams ("
+                " key TEXT PRIMARY KEY, name TEXT, team_id TEXT NOT NULL,"
+                " slug TEXT NOT NULL, updated_at REAL, expires_at REAL)"
+            )
+            # Eski depolarda kolon yok; NULL = kalıcı (kesin eşleşme)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(teams)")}
+            if "expires_at" not in columns:
+                self._conn.execute("ALTER TABLE teams ADD COLUMN expires_at REAL")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, team_name: str) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT team_id, slug FROM teams WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (normalize_team_name(team_name), time.time()),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, team_name: str, team_id: str, slug: str, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO teams (key, name, team_id, slug, updated_at, expires_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_team_name(team_name), team_name, team_id, slug, now, now + ttl if ttl else None),
+            )
+            db.commit()
+
+    def lookup_url(self, team_name: str) -> Optional[str]:
+        hit = self.get(team_name)
+        return team_page_url(*hit) if hit else None
+
+    def remember_url(self, team_name: str, team_url: Optional[str], ttl: Optional[float] = None) -> None:
+        parsed = parse_team_url(team_url)
+        if parsed:
+            self.put(team_name, *parsed, ttl=ttl)
+
+
+team_store = TeamStore()
+
+
+def load_team_names(path: Optional[str] = None) -> List[str]:
+    path = path or os.path.join(PUBLIC_DATA_DIR, "takimlar.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [n for n in json.load(f) if isinstance(n, str)]
+    except Exception as e:
+        print(f"[WARN] takım listesi okunamadı: {path} {e}")
+        return []
+
+
+def prewarm_team_store(search_fn: Callable[[str], Optional[str]], path: Optional[str] = None) -> int:
+    # Sadece henüz çözülmemiş takımlar için arama yapılır; search_fn sonucu depoya yazar
+    resolved = 0
+    for name in load_team_names(path):
+        if team_store.get(name):
+            continue
+        try:
+            if search_fn(name):
+                resolved += 1
+        except Exception as e:
+            print(f"[WARN] prewarm {name}: {e}")
+    print(f"[LOG] takım deposu ısıtıldı: {resolved} yeni takım")
+    return resolved
@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Backend modülleri düz (paket değil) import edilir; SQLite depoları geçici klasöre yazılsın
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("FOOTBALL_CACHE_DIR", tempfile.mkdtemp(prefix="football-tests-"))
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
@@ -0,0 +1,207 @@
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+import pytest
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from conftest import PAGES_DIR
+from html_parsing import (
+    get_match_result_emoji,
+    parse_fixture_rows,
+    parse_referee_profile,
+    parse_referee_season_stats,
+    parse_team_header,
+    team_name_Temizle,
+    temizle_takim_adi,
+)
+
+# Yeni (strainer + lxml) ayrıştırıcılar, kaydedilmiş sayfalarda eski tam ağaç html.parser gövdeleriyle
+# (team_info.get_team_last_5_matches_with_tactics / get_team_info / get_referee_info) aynı sonucu vermeli.
+
+
+def page(name: str) -> str:
+    with open(os.path.join(PAGES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def legacy_fixture_rows(html: str, team_name: str) -> List[Dict[str, Any]]:
+    s = BeautifulSoup(html, "html.parser")
+    div = s.find("div", class_="responsive-table")
+    if not isinstance(div, Tag):
+        return []
+    body = div.find("tbody")
+    if not isinstance(body, Tag):
+        return []
+    out = []
+    for row in body.find_all("tr"):
+        cols = row.find_all("td") if isinstance(row, Tag) else []
+        if len(cols) < 10:
+            continue
+        t = cols[1].get_text(strip=True)
+        sc = cols[-1].get_text(strip=True)
+        parts = sc.split(":")
+        opp = cols[6].get_text(strip=True)
+        em = ""
+        try:
+            if temizle_takim_adi(opp) == team_name_Temizle(team_name):
+                opp = cols[4].get_text(strip=True)
+                if len(parts) == 2:
+                    og, tg = map(int, parts)
+                    em = get_match_result_emoji(tg, og)
+            elif len(parts) == 2:
+                tg, og = map(int, parts)
+                em = get_match_result_emoji(tg, og)
+        except Exception:
+            continue
+        df = cols[-4].get_text(strip=True) or "Yok"
+        if re.match(r"\d+:\d+", sc):
+            out.append({"tarih": t, "rakip": opp, "sonuc": sc, "dizilis": df, "emoji": em})
+    return out
+
+
+def legacy_team_header(html: str) -> Dict[str, Any]:
+    soup = BeautifulSoup(html, "html.parser")
+    tn = soup.find("h1", class_="data-header__headline-wrapper")
+    team_name = tn.get_text(strip=True) if isinstance(tn, Tag) else "?"
+    lg = soup.find("span", class_="data-header__club")
+    league_name = lg.get_text(strip=True) if isinstance(lg, Tag) else "?"
+    league_rank = "?"
+    for label in soup.find_all("span", class_="data-header__label"):
+        if "Lig Sıralaması" in label.get_text():
+            cont = label.find_next_sibling("span", class_="data-header__content")
+            if isinstance(cont, Tag):
+                a = cont.find("a")
+                league_rank = a.get_text(strip=True) if isinstance(a, Tag) else cont.get_text(strip=True)
+            break
+    logo_div = soup.find("div", class_="data-header__profile-container")
+    logo_img = logo_div.find("img") if isinstance(logo_div, Tag) else None
+    logo_url = logo_img["src"] if isinstance(logo_img, Tag) and logo_img.has_attr("src") else None
+    cups = []
+    for cup in soup.find_all("a", class_="data-header__success-data"):
+        title = cup.get("title", "Kupa")
+        num = cup.find("span", class_="data-header__success-number")
+        cups.append(f"{title}: {num.get_text(strip=True) if isinstance(num, Tag) else '?'}")
+    market = soup.find("a", class_="data-header__market-value-wrapper")
+    squad_value = market.get_text(strip=True) if isinstance(market, Tag) else "?"
+
+    def find_data(label_text: str) -> str:
+        for li in soup.select("ul.data-header__items li"):
+            if label_text in li.get_text():
+                cont = li.find("span", class_="data-header__content")
+                return cont.get_text(strip=True) if isinstance(cont, Tag) else "?"
+        return "?"
+
+    return {
+        "Takım": team_name,
+        "Lig": league_name,
+        "Lig Sıralaması": league_rank,
+        "Logo URL": logo_url,
+        "Kupalar": cups,
+        "Kadro Değeri": squad_value,
+        "Yaş Ortalaması": find_data("Yaş ortalaması"),
+        "Stadyum": find_data("Stadyum"),
+    }
+
+
+def legacy_referee_profile(html: str, season: str) -> Dict[str, Any]:
+    s = BeautifulSoup(html, "html.parser")
+    img_tag = s.find("img", class_="data-header__profile-image")
+    img_url: Optional[str] = None
+    if isinstance(img_tag, Tag) and img_tag.has_attr("src"):
+        img_url = img_tag.get("src")
+    spans = s.select("div.info-table--equal-space > span.info-table__content--bold")
+    dob = spans[0].get_text(strip=True) if spans else "?"
+    birthplace = next((sp.get_text(strip=True) for sp in spans if "Türkiye" in sp.get_text()), "?")
+    action = season_id = None
+    form = s.find("form", action=re.compile(r"/profil/schiedsrichter"))
+    if isinstance(form, Tag):
+        action = form.get("action")
+        sel = form.select_one("select[name='saison_id']")
+        if isinstance(sel, Tag):
+            opt = next((o for o in sel.find_all("option") if season in o.get_text()), None)
+            if isinstance(opt, Tag) and opt.get("value"):
+                season_id = opt.get("value")
+    return {"photo_url": img_url, "dob": dob, "birthplace": birthplace, "form_action": action, "season_id": season_id}
+
+
+def legacy_referee_season_stats(html: str) -> Dict[str, int]:
+    stats = {"Maç": 0, "Sarı Kart": 0, "2. Sarıdan Kırmızı": 0, "Direkt Kırmızı": 0, "Penaltı": 0}
+    tb2 = BeautifulSoup(html, "html.parser").find("table", class_="items")
+    tbod = tb2.find("tbody") if isinstance(tb2, Tag) else None
+    if isinstance(tbod, Tag):
+        for rw in tbod.find_all("tr"):
+            cd = rw.find_all("td")
+            if len(cd) >= 7:
+                try:
+                    stats["Maç"] += int(cd[2].get_text(strip=True))
+                    stats["Sarı Kart"] += int(cd[3].get_text(strip=True))
+                    stats["2. Sarıdan Kırmızı"] += int(cd[4].get_text(strip=True))
+                    stats["Direkt Kırmızı"] += int(cd[5].get_text(strip=True))
+                    stats["Penaltı"] += int(cd[6].get_text(strip=True))
+                except ValueError:
+                    pass
+    return stats
+
+
+def test_fixture_rows_match_legacy_parser():
+    html = page("fixtures_galatasaray.html")
+    rows = parse_fixture_rows(html, "Galatasaray")
+    assert rows == legacy_fixture_rows(html, "Galatasaray")
+    # Oynanmamış/ertelenmiş maçlar ve ara başlık satırı atlanır
+    assert [r["sonuc"] for r in rows] == ["2:1", "1:2", "5:0", "1:3", "1:1", "3:3", "0:2"]
+    assert rows[1]["rakip"] == "Konyaspor(3.)" and rows[1]["emoji"] == "✅"
+    assert rows[2]["dizilis"] == "Yok"
+
+
+def test_fixture_rows_side_flag_is_opt_in():
+    html = page("fixtures_galatasaray.html")
+    assert all("ev" not in r for r in parse_fixture_rows(html, "Galatasaray"))
+    sided = parse_fixture_rows(html, "Galatasaray", with_side=True)
+    assert [r["ev"] for r in sided] == [True, False, True, False, True, False, True]
+    assert [{k: v for k, v in r.items() if k != "ev"} for r in sided] == legacy_fixture_rows(html, "Galatasaray")
+
+
+def test_fixture_rows_limit():
+    assert len(parse_fixture_rows(page("fixtures_galatasaray.html"), "Galatasaray", limit=3)) == 3
+
+
+def test_team_header_matches_legacy_parser():
+    html = page("team_galatasaray.html")
+    header = parse_team_header(html)
+    assert header == legacy_team_header(html)
+    assert header["Takım"] == "Galatasaray"
+    assert header["Lig Sıralaması"] == "1."
+    assert header["Kupalar"] == ["Türkiye Şampiyonu: 24", "UEFA Kupası Şampiyonu: 1"]
+    assert header["Yaş Ortalaması"] == "27,6"
+
+
+@pytest.mark.parametrize("season", ["2024", "2023"])
+def test_referee_profile_matches_legacy_parser(season):
+    html = page("referee_profile.html")
+    profile = parse_referee_profile(html)
+    legacy = legacy_referee_profile(html, season)
+    season_id = next((v for label, v in profile["seasons"].items() if season in label), None)
+    assert {k: profile[k] for k in ("photo_url", "dob", "birthplace", "form_action")} == \
+        {k: legacy[k] for k in ("photo_url", "dob", "birthplace", "form_action")}
+    assert season_id == legacy["season_id"] == season
+    assert profile["dob"] == "13.01.1985 (39)"
+    assert profile["form_action"] == "/arda-kardesler/profil/schiedsrichter/1234"
+
+
+def test_referee_season_stats_match_legacy_parser():
+    html = page("referee_season_stats.html")
+    stats = parse_referee_season_stats(html)
+    assert stats is not None
+    assert list(stats.values()) == [23, 112, 2, 4, 10]  # tfoot toplamı sayılmaz
+    # Eski gövde sayısal olmayan hücreye ("-") kadar olan sütunları yine de eklerdi; yeni ayrıştırıcı
+    # satırı bütünüyle atlar. O satır çıkarılınca iki ayrıştırıcı aynı toplamı verir
+    partial_row = re.search(r"<tr><td class='hauptlink'><img src='/logo/UEFA Avrupa Ligi.png'/>.*?</tr>", html)
+    assert partial_row is not None
+    legacy = legacy_referee_season_stats(html.replace(partial_row.group(0), ""))
+    assert list(stats.values()) == list(legacy.values())
+
+
+def test_referee_season_stats_missing_table():
+    assert parse_referee_season_stats(page("referee_profile.html").replace("class='items'", "")) is None
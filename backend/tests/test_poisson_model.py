@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import gpt_area
+from poisson_model import MatchRecord, PoissonModel, records_from_fixtures
+
+
+def synthetic_league(seed: int = 7, rounds: int = 30):
+    # Bilinen güçlerle çok devreli lig; güçler kesin sıralı (a en iyi hücum ve savunma).
+    # Devre sayısı, sıralama örnekleme gürültüsüyle bozulmayacak kadar yüksek tutulur
+    rng = np.random.default_rng(seed)
+    names = ["a", "b", "c", "d", "e", "f"]
+    attack = np.linspace(0.8, -0.8, len(names))
+    defence = np.linspace(-0.6, 0.6, len(names))
+    start = datetime(2024, 8, 1)
+    records = []
+    day = 0
+    for _ in range(rounds):
+        for i, home in enumerate(names):
+            for j, away in enumerate(names):
+                if i == j:
+                    continue
+                lam_h = np.exp(0.2 + 0.25 + attack[i] + defence[j])
+                lam_a = np.exp(0.2 + attack[j] + defence[i])
+                records.append(MatchRecord(home, away, int(rng.poisson(lam_h)), int(rng.poisson(lam_a)),
+                                           start + timedelta(days=day)))
+                day += 1
+    return names, records
+
+
+@pytest.mark.parametrize("records", [[], [MatchRecord("x", "y", 2, 1)]])
+def test_outcome_probabilities_sum_to_one(records):
+    model = PoissonModel().fit(records)
+    pred = model.predict("x", "y")
+    assert sum(pred["outcome"].values()) == pytest.approx(1.0, abs=1e-9)
+    assert model.score_matrix("x", "y").sum() == pytest.approx(1.0)
+    assert 0.0 <= pred["over_2_5"] <= 1.0 and 0.0 <= pred["btts"] <= 1.0
+
+
+def test_synthetic_league_strength_order():
+    names, records = synthetic_league()
+    model = PoissonModel(decay=0.0).fit(records)
+    idx = [model.teams[n] for n in names]
+    assert list(np.argsort(-model.attack[idx])) == list(range(len(names)))
+    assert list(np.argsort(model.defence[idx])) == list(range(len(names)))
+    assert model.home_adv > 0
+    strong_home = model.predict("a", "f")["outcome"]
+    weak_home = model.predict("f", "a")["outcome"]
+    assert strong_home["1"] > strong_home["2"] and weak_home["2"] > weak_home["1"]
+    assert sum(strong_home.values()) == pytest.approx(1.0)
+
+
+def test_records_from_fixtures_uses_side_flag():
+    rows = [
+        {"tarih": "10.08.2024", "rakip": "Hatayspor", "sonuc": "2:1", "ev": True},
+        {"tarih": "17.08.2024", "rakip": "Konyaspor(3.)", "sonuc": "1:2", "ev": False},
+        {"tarih": "24.08.2024", "rakip": "Rizespor", "sonuc": "-:-", "ev": True},
+    ]
+    records = records_from_fixtures("Galatasaray", rows)
+    assert [(r.home, r.away, r.home_goals, r.away_goals) for r in records] == [
+        ("galatasaray", "hatayspor", 2, 1),
+        ("konyaspor", "galatasaray", 1, 2),
+    ]
+    assert records[0].date == datetime(2024, 8, 10)
+
+
+def test_local_prediction_without_matches_returns_error(monkeypatch):
+    monkeypatch.setattr(gpt_area, "get_team_matches", lambda team, with_side=False: [])
+    result = gpt_area.predict_match_local("Galatasaray", "Fenerbahçe")
+    assert result["prediction"].startswith("[ERROR]")
+    assert result["details"] == {}
@@ -0,0 +1,234 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+from frame_sampler import AdaptiveSampler
+from player_detector import PlayerDetector, get_detector
+from team_colors import batch_hsv_means
+
+# youtube_url analiz modu için akışlı video hattı.
+# yt-dlp sadece akış URL'sini çözer (indirme yok); OpenCV kareleri parça parça çözer,
+# kareler sınırlı bir kuyruk üzerinden süreç havuzuna gider. Böylece çözme ve analiz farklı
+# çekirdeklerde üst üste biner. Sonuçlar kare sırasına göre dizilip on_frame'e verilir.
+# Yerel bir dosya yolu da kaynak olarak verilebilir (test / benchmark).
+
+VIDEO_WORKERS = int(os.environ.get("VIDEO_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+VIDEO_QUEUE_SIZE = int(os.environ.get("VIDEO_QUEUE_SIZE", "16"))
+VIDEO_FRAME_STRIDE = int(os.environ.get("VIDEO_FRAME_STRIDE", "5"))  # her N. kare analiz edilir
+VIDEO_MAX_FRAMES = int(os.environ.get("VIDEO_MAX_FRAMES", "2000"))  # analiz edilecek en fazla kare
+VIDEO_MAX_WIDTH = int(os.environ.get("VIDEO_MAX_WIDTH", "960"))  # süreçlere gönderilmeden önce küçültme
+VIDEO_FORMAT = os.environ.get("VIDEO_FORMAT", "best[height<=720][vcodec!=none]/best[height<=720]/best")
+# Sunucu thread'leri varken fork güvenli değil; işçiler temiz süreçle başlatılır
+VIDEO_MP_START = os.environ.get("VIDEO_MP_START", "spawn")
+# Açıkken stride taban aralıktır; saha dışı/durağan kareler atlanır, sahne kesmesinde sıklaşır (frame_sampler)
+VIDEO_ADAPTIVE = os.environ.get("VIDEO_ADAPTIVE", "1") == "1"
+
+_WORKER_CONFIG: Dict[str, Any] = {}
+_WORKER_DETECTOR: Optional[PlayerDetector] = None
+
+
+def resolve_stream_url(source: str) -> Tuple[str, Dict[str, Any]]:
+    # Yerel dosya olduğu gibi kullanılır; aksi hâlde yt-dlp ile doğrudan medya URL'si alınır
+    if os.path.exists(source):
+        return source, {"title": os.path.basename(source)}
+    import yt_dlp  # type: ignore
+
+    opts = {"format": VIDEO_FORMAT, "quiet": True, "no_warnings": True, "noplaylist": True, "skip_download": True}
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        info = ydl.extract_info(source, download=False)
+    url = info.get("url") or next(
+        (f["url"] for f in reversed(info.get("requested_formats") or []) if f.get("vcodec") not in (None, "none")), None
+    )
+    if not url:
+        raise ValueError(f"Video akış URL'si çözülemedi: {source}")
+    return url, {"title": info.get("title"), "duration": info.get("duration"), "fps": info.get("fps")}
+
+
+def _worker_init(config: Dict[str, Any]) -> None:
+    global _WORKER_DETECTOR
+    _WORKER_CONFIG.clear()
+    _WORKER_CONFIG.update(config)
+    _WORKER_DETECTOR = None
+
+
+def analyze_frame(index: int, frame: np.ndarray) -> Dict[str, Any]:
+    # İşçi süreçte çalışır: oyuncu kutuları ve kutu başına forma rengi. HSV kare bir kez hesaplanır,
+    # dedektör maskesi ve renk ortalamaları aynı diziyi kullanır (her kutu için, izden bağımsız: izleme
+    # ana süreçte sonradan yapılır). Takım ataması ve hangi kutunun yeniden sınıflanacağı ana süreçte seçilir.
+    global _WORKER_DETECTOR
+    if _WORKER_DETECTOR is None:
+        _WORKER_DETECTOR = get_detector(_WORKER_CONFIG.get("detector"))
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    dets = _WORKER_DETECTOR.detect(frame, hsv=hsv)
+    return {
+        "frame": index,
+        "green_ratio": dets.meta.get("green_ratio", 0.0),
+        "boxes": dets.xyxy,
+        "box_conf": dets.conf,
+        "players_hsv": batch_hsv_means(frame, dets.xyxy, hsv=hsv),
+        "frame_size": frame.shape[1::-1],
+    }
+
+
+def _decode(url: str, frames: "queue.Queue[Optional[Tuple[int, np.ndarray]]]", stop: threading.Event,
+            stats: Dict[str, Any], stride: int, max_frames: int, max_width: int, adaptive: bool) -> None:
+    cap = cv2.VideoCapture(url)
+    sampler = AdaptiveSampler(stride) if adaptive else None
+    try:
+        if not cap.isOpened():
+            stats["error"] = "video açılamadı"
+            return
+        stats["source_fps"] = cap.get(cv2.CAP_PROP_FPS) or None
+        index = 0
+        sent = 0
+        next_probe = 0
+        while not stop.is_set() and sent < max_frames:
+            # Yoklamalar arasındaki karelerde sadece grab(): piksel verisi çözülmez/kopyalanmaz
+            if index < next_probe:
+                if not cap.grab():
+                    break
+                index += 1
+                continue
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if sampler is not None:
+                wanted = sampler.check(index, frame)
+                next_probe = index + sampler.step
+                if not wanted:
+                    index += 1
+                    continue
+            else:
+                next_probe = index + stride
+            if max_width and frame.shape[1] > max_width:
+                scale = max_width / frame.shape[1]
+                frame = cv2.resize(frame, (max_width, int(frame.shape[0] * scale)), interpolation=cv2.INTER_AREA)
+            while not stop.is_set():
+                try:
+                    frames.put((index, frame), timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+            sent += 1
+            index += 1
+        stats["frames_decoded"] = index
+        if sampler is not None:
+            stats["sampling"] = sampler.report(index)
+    except Exception as e:
+        stats["error"] = str(e)
+    finally:
+        cap.release()
+        # Tüketici hâlâ okuyorsa bitiş işareti mutlaka iletilir; hat durdurulduysa beklenmez
+        while True:
+            try:
+                frames.put(None, timeout=0.5)
+                break
+            except queue.Full:
+                if stop.is_set():
+                    break
+
+
+def run_video_pipeline(
+    source: str,
+    analyzer: Callable[[int, np.ndarray], Dict[str, Any]] = analyze_frame,
+    on_frame: Optional[Callable[[Dict[str, Any]], None]] = None,
+    config: Optional[Dict[str, Any]] = None,
+    workers: int = VIDEO_WORKERS,
+    stride: int = VIDEO_FRAME_STRIDE,
+    max_frames: int = VIDEO_MAX_FRAMES,
+    max_width: int = VIDEO_MAX_WIDTH,
+    adaptive: bool = VIDEO_ADAPTIVE,
+) -> Dict[str, Any]:
+    # analyzer modül seviyesinde bir fonksiyon olmalı (süreçlere pickle ile gider)
+    start = time.perf_counter()
+    url, info = resolve_stream_url(source)
+    stats: Dict[str, Any] = {"frames_decoded": 0}
+    frames: "queue.Queue[Optional[Tuple[int, np.ndarray]]]" = queue.Queue(maxsize=VIDEO_QUEUE_SIZE)
+    stop = threading.Event()
+    decoder = threading.Thread(target=_decode, args=(url, frames, stop, stats, max(1, stride), max_frames, max_width, adaptive),
+                               name="video-decode", daemon=True)
+
+    order: Deque[int] = deque()
+    done_results: Dict[int, Dict[str, Any]] = {}
+    analyzed = 0
+    green_total = 0.0
+
+    def emit(fut: Future) -> None:
+        nonlocal analyzed, green_total
+        index = pending_index.pop(fut)
+        try:
+            done_results[index] = fut.result()
+        except Exception as e:
+            # Tek karelik hata tüm analizi durdurmaz; sıra bozulmasın diye boş sonuç yazılır
+            print(f"[WARN] kare {index} analiz edilemedi: {e}")
+            stats["frame_errors"] = stats.get("frame_errors", 0) + 1
+            done_results[index] = {"frame": index, "error": str(e)}
+        # Sıralı tüketici (ör. takip, ısı haritası) için kareler geldiği sırayla değil, video sırasıyla verilir
+        while order and order[0] in done_results:
+            r = done_results.pop(order.popleft())
+            analyzed += 1
+            green_total += r.get("green_ratio", 0.0)
+            if on_frame is not None:
+                on_frame(r)
+
+    ctx = multiprocessing.get_context(VIDEO_MP_START)
+    max_inflight = max(2, workers * 2)
+    pending: Set[Future] = set()
+    pending_index: Dict[Future, int] = {}
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_worker_init,
+                                 initargs=(config or {},)) as pool:
+            decoder.start()
+            while True:
+                item = frames.get()
+                if item is None:
+                    break
+                index, frame = item
+                order.append(index)
+                fut = pool.submit(analyzer, index, frame)
+                pending_index[fut] = index
+                pending.add(fut)
+                # Havuzda en fazla max_inflight kare bekler; dolunca çözücü kuyruğu da dolar ve yavaşlar
+                if len(pending) >= max_inflight:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        emit(fut)
+            finished, pending = wait(pending)
+            for fut in finished:
+                emit(fut)
+    finally:
+        stop.set()
+        decoder.join(timeout=5)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "source": info,
+        "frames_decoded": stats.get("frames_decoded", 0),
+        "frames_analyzed": analyzed,
+        "frames_skipped": max(0, stats.get("frames_decoded", 0) - analyzed),
+        "stride": stride,
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "fps": round(analyzed / elapsed, 2) if elapsed else 0.0,
+        "decode_fps": round(stats.get("frames_decoded", 0) / elapsed, 2) if elapsed else 0.0,
+        "avg_green_ratio": round(green_total / analyzed, 4) if analyzed else None,
+    }
+    if stats.get("sampling"):
+        summary["sampling"] = stats["sampling"]
+    if stats.get("source_fps"):
+        summary["source_fps"] = stats["source_fps"]
+    if stats.get("frame_errors"):
+        summary["frame_errors"] = stats["frame_errors"]
+    if stats.get("error"):
+        summary["error"] = stats["error"]
+    print(f"[LOG] video: {analyzed} kare analiz edildi, {summary['frames_skipped']} kare atlandı, "
+          f"{summary['fps']} kare/sn ({workers} işçi)")
+    return summary
@@ -1,5 +1,31 @@
 import React, { useState, useEffect } from 'react';
 
+// Akışla gelen bölümler bu iskeletin üzerine birleştirilir
+const emptyTeam = (name) => ({
+  name,
+  info: {},
+  logo: null,
+  last_matches: [],
+  stats: { wins: 0, draws: 0, losses: 0 },
+  performance_analysis: {}
+});
+
+const emptyAnalysisResults = (teamA, teamB) => ({
+  teams: { team_a: emptyTeam(teamA), team_b: emptyTeam(teamB) },
+  referees: { main: null, side: null },
+  head_to_head: []
+});
+
+const deepMerge = (target, source) => {
+  const out = { ...target };
+  Object.entries(source).forEach(([key, value]) => {
+    const isObject = value && typeof value === 'object' && !Array.isArray(value);
+    const targetIsObject = out[key] && typeof out[key] === 'object' && !Array.isArray(out[key]);
+    out[key] = isObject && targetIsObject ? deepMerge(out[key], value) : value;
+  });
+  return out;
+};
+
 const Home = () => {
   // Takım önerileri listesi
   
@@ -223,18 +249,35 @@ const Home = () => {
         setAnalysisStatus('running');
         setAnalysisMessage('🔄 Analiz devam ediyor...');
 
-        const interval = setInterval(async () => {
-          const statusResponse = await fetch(`${BASE_URL}/analysis-status`);
-          const statusResult = await statusResponse.json();
-
-          if (statusResult.status === 'completed') {
-            clearInterval(interval);
-            setAnalysisStatus('completed');
-            setAnalysisMessage('✅ Analiz tamamlandı!');
-            setAnalysisResults(statusResult.results);
+        // Bölümler hazır oldukça sunucudan gelir (SSE); polling yok
+        setAnalysisResults(emptyAnalysisResults(formData.teamA, formData.teamB));
+        const source = new EventSource(`${BASE_URL}/analysis-stream/${result.job_id}`);
+        ['team_info', 'form', 'head_to_head', 'referees', 'logos'].forEach((section) => {
+          source.addEventListener(section, (event) => {
+            const fragment = JSON.parse(event.data);
+            setAnalysisResults((prev) => deepMerge(prev, fragment));
+          });
+        });
+        source.addEventListener('completed', (event) => {
+          source.close();
+          setAnalysisStatus('completed');
+          setAnalysisMessage('✅ Analiz tamamlandı!');
+          setAnalysisResults(JSON.parse(event.data));
+          setLoading(false);
+        });
+        source.addEventListener('failed', () => {
+          source.close();
+          setAnalysisStatus('error');
+          setAnalysisMessage('❌ Analiz başarısız oldu');
+          setLoading(false);
+        });
+        source.onerror = () => {
+          if (source.readyState === EventSource.CLOSED) {
+            setAnalysisStatus('error');
+            setAnalysisMessage('❌ Bağlantı hatası');
             setLoading(false);
           }
-        }, 5000);
+        };
       } else {
         setAnalysisStatus('error');
         setAnalysisMessage('❌ Analiz başlatılamadı');
@@ -693,7 +736,7 @@ const Home = () => {
                     <div className="flex items-center mb-6">
                       {analysisResults.teams.team_a.logo && (
                         <img
-                          src={`data:image/png;base64,${analysisResults.teams.team_a.logo}`}
+                          src={`${BASE_URL}${analysisResults.teams.team_a.logo}`}
                           alt="Team A Logo"
                           className="w-16 h-16 rounded-full mr-4 border-4 border-white shadow-lg"
                         />
@@ -744,7 +787,7 @@ const Home = () => {
                     <div className="flex items-center mb-6">
                       {analysisResults.teams.team_b.logo && (
                         <img
-                          src={`data:image/png;base64,${analysisResults.teams.team_b.logo}`}
+                          src={`${BASE_URL}${analysisResults.teams.team_b.logo}`}
                           alt="Team B Logo"
                           className="w-16 h-16 rounded-full mr-4 border-4 border-white shadow-lg"
                         />
@@ -802,7 +845,7 @@ const Home = () => {
                         <div className="absolute inset-0 bg-black/30 rounded-2xl pointer-events-none"></div>
                         <div className="relative z-10 flex flex-col items-center w-full">
                           {analysisResults.referees.main.photo && (
-                            <img src={`data:image/png;base64,${analysisResults.referees.main.photo}`} alt="Ana Hakem" className="w-20 h-20 rounded-full mb-4 border-4 border-white shadow-lg" />
+                            <img src={`${BASE_URL}${analysisResults.referees.main.photo}`} alt="Ana Hakem" className="w-20 h-20 rounded-full mb-4 border-4 border-white shadow-lg" />
                           )}
                           <h3 className="text-2xl font-extrabold mb-2 font-sans tracking-tight drop-shadow-lg">{analysisResults.referees.main.name || "Ana Hakem"}</h3>
                           <div className="text-base text-cyan-100 space-y-1 text-center font-mono w-full">
@@ -817,7 +860,7 @@ const Home = () => {
                         <div className="absolute inset-0 bg-black/30 rounded-2xl pointer-events-none"></div>
                         <div className="relative z-10 flex flex-col items-center w-full">
                           {analysisResults.referees.side.photo && (
-                            <img src={`data:image/png;base64,${analysisResults.referees.side.photo}`} alt="Yan Hakem" className="w-20 h-20 rounded-full mb-4 border-4 border-white shadow-lg" />
+                            <img src={`${BASE_URL}${analysisResults.referees.side.photo}`} alt="Yan Hakem" className="w-20 h-20 rounded-full mb-4 border-4 border-white shadow-lg" />
                           )}
                           <h3 className="text-2xl font-extrabold mb-2 font-sans tracking-tight drop-shadow-lg">{analysisResults.referees.side.name || "Yan Hakem"}</h3>
                           <div className="text-base text-cyan-100 space-y-1 text-center font-mono w-full">